@@ -8,3 +8,7 @@ class InvalidSubwaySystemInputException(Exception):
 
 class InvalidSubwayStopInputException(Exception):
     ...
+
+
+class InvalidGraphBackendException(Exception):
+    ...
@@ -3,7 +3,7 @@ from typing import List
 from models import Route
 from route_data_repository import RouteDataRepository
 from settings import get_settings
-from subway_system_dict_graph import SubwaySystemDictGraph
+from subway_system_graph_backend import SubwaySystemGraphBackend, get_graph_backend
 
 
 def get_subway_system_from_user() -> str:
@@ -34,21 +34,24 @@ def get_subway_stops_from_user(subway_system: str) -> List[str]:
     return [x.strip() for x in subway_stops_str.split(",")]
 
 
-def collect_route_info(routes: List[Route]) -> dict:
+def collect_route_info(routes: List[Route], graph: SubwaySystemGraphBackend) -> dict:
     """
     Collects and returns route information.
 
     Args:
         routes (List[Route]): A list of Route objects.
+        graph (SubwaySystemGraphBackend): The graph built from the routes, whose stop sequence index caches their
+            stop counts.
 
     Returns:
         dict: A dictionary containing route information with route names as keys and their maximum and minimum stops as values.
     """
+    stop_sequence_index = graph.stop_sequence_index
     route_info = {}
     for route in routes:
         route_info[route.name] = {
-            "max_stops": route.max_num_stops,
-            "min_stops": route.min_num_stops,
+            "max_stops": stop_sequence_index.get_max_num_stops(route.route_id),
+            "min_stops": stop_sequence_index.get_min_num_stops(route.route_id),
         }
     return route_info
 
@@ -62,7 +65,8 @@ def main():
     routes = route_repository.create_routes_intermediate_data_structure()
     print(routes)
 
-    route_info = collect_route_info(routes)
+    graph = get_graph_backend(settings.graph_backend)(routes)
+    route_info = collect_route_info(routes, graph)
 
     max_stops_route_name = max(
         route_info, key=lambda name: route_info[name]["max_stops"]
@@ -79,7 +83,6 @@ def main():
         f"Route with fewest stops: {min_stops_route_name} @ {route_info[min_stops_route_name]['min_stops']} stops\n "
     )
 
-    graph = SubwaySystemDictGraph(routes)
     transfer_stops = graph.get_transfer_stops()
 
     print(
@@ -90,10 +93,18 @@ def main():
 
     subway_stop_names = get_subway_stops_from_user(subway_system)
 
-    routes_within_path = graph.find_routes_between_two_stops(*subway_stop_names)
+    itinerary = graph.find_itinerary_between_two_stops(*subway_stop_names)
+    if itinerary is None:
+        print("\nThese two stops are not connected by subway.")
+        return
+
     print(
-        f"\nTo travel between these two stops, you can take the following subway routes: {', '.join(routes_within_path[0])}"
+        f"\nTo travel between these two stops, you can take the following subway routes: {', '.join(itinerary.route_names)}"
     )
+    for leg in itinerary.legs:
+        print(
+            f"  {leg.route_name}: board at {leg.boarding_stop}, ride {leg.num_stops} stop(s) to {leg.alighting_stop}"
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,411 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Optional, Tuple
+
+from custom_types import RouteID, StopID, RouteName, StopName
+from models import Route, RoutePattern, Stop
+from route_data_repository import RouteDataRepository
+from settings import Settings
+
+TRIPS_PATH_PATTERN = re.compile(r"^/trips/(?P<trip_id>[^/]+)$")
+
+
+def create_routes_response(routes: List[Route]) -> dict:
+    """
+    Create the /routes?include=route_patterns API response for a list of Route objects, in the same JSON:API format as
+    the MBTA API.
+
+    Args:
+        routes (List[Route]): A list of Route objects.
+
+    Returns:
+        dict: The API response as a dictionary.
+    """
+    return {
+        "data": [
+            {"id": route.route_id, "attributes": {"long_name": route.name}}
+            for route in routes
+        ],
+        "included": [
+            {
+                "id": route_pattern.route_pattern_id,
+                "attributes": {
+                    "canonical": True,
+                    "direction_id": 0,
+                    "name": route_pattern.route_pattern_name,
+                },
+                "relationships": {
+                    "route": {"data": {"id": route.route_id}},
+                    "representative_trip": {
+                        "data": {"id": route_pattern.representative_trip_id}
+                    },
+                },
+            }
+            for route in routes
+            for route_pattern in route.route_patterns
+        ],
+    }
+
+
+def create_trip_responses(routes: List[Route]) -> Dict[str, dict]:
+    """
+    Create the /trips/{trip_id}?include=stops API response for the representative trip of every route pattern in a
+    list of Route objects, in the same JSON:API format as the MBTA API.
+
+    Args:
+        routes (List[Route]): A list of Route objects.
+
+    Returns:
+        Dict[str, dict]: A dictionary mapping trip IDs to API responses.
+    """
+    return {
+        route_pattern.representative_trip_id: {
+            "data": {
+                "id": route_pattern.representative_trip_id,
+                "relationships": {
+                    "stops": {
+                        "data": [{"id": stop.stop_id} for stop in route_pattern.stops]
+                    }
+                },
+            },
+            "included": [
+                {"id": stop.stop_id, "attributes": {"name": stop.name}}
+                for stop in route_pattern.stops
+            ],
+        }
+        for route in routes
+        for route_pattern in route.route_patterns
+    }
+
+
+def generate_synthetic_routes(
+    num_rows: int = 20, stops_per_row: int = 50, transfer_interval: int = 5
+) -> List[Route]:
+    """
+    Generate a large, fully connected subway system shaped like a grid, for load testing.
+
+    There is one route along every row of the grid, and one route down every transfer_interval-th column. Every stop
+    on a column route is also on a row route, so those stops are the transfer stops.
+
+    Args:
+        num_rows (int): The number of row routes.
+        stops_per_row (int): The number of stops on each row route.
+        transfer_interval (int): The number of stops between two column routes.
+
+    Returns:
+        List[Route]: A list of Route objects with num_rows * stops_per_row stops in total.
+    """
+    stops = [
+        [
+            Stop(
+                stop_id=StopID(f"{row}-{column}"), name=StopName(f"Stop {row}-{column}")
+            )
+            for column in range(stops_per_row)
+        ]
+        for row in range(num_rows)
+    ]
+
+    routes: List[Route] = []
+    for row in range(num_rows):
+        routes.append(
+            Route(
+                route_id=RouteID(f"Row-{row}"),
+                name=RouteName(f"Row {row} Line"),
+                route_patterns=[
+                    RoutePattern(
+                        route_pattern_id=f"Row-{row}-0",
+                        route_pattern_name=f"Stop {row}-0 - Stop {row}-{stops_per_row - 1}",
+                        representative_trip_id=f"canonical-Row-{row}-0",
+                        stops=stops[row],
+                    )
+                ],
+            )
+        )
+    for column in range(0, stops_per_row, transfer_interval):
+        routes.append(
+            Route(
+                route_id=RouteID(f"Column-{column}"),
+                name=RouteName(f"Column {column} Line"),
+                route_patterns=[
+                    RoutePattern(
+                        route_pattern_id=f"Column-{column}-0",
+                        route_pattern_name=f"Stop 0-{column} - Stop {num_rows - 1}-{column}",
+                        representative_trip_id=f"canonical-Column-{column}-0",
+                        stops=[stops[row][column] for row in range(num_rows)],
+                    )
+                ],
+            )
+        )
+
+    return routes
+
+
+def record_transit_api_responses(settings: Settings, path: str) -> None:
+    """
+    Fetch the /routes response and the /trips response of every canonical route pattern from a transit API, and save
+    them to a JSON file that MockTransitAPIServer.from_recording can replay.
+
+    Args:
+        settings (Settings): The settings of the transit API to record.
+        path (str): The path of the JSON file to write.
+    """
+    route_repository = RouteDataRepository(settings)
+
+    get_routes_response = route_repository._get_subway_routes_and_route_patterns()
+    route_patterns_map = route_repository._map_route_patterns_to_route_id(
+        get_routes_response["included"]
+    )
+
+    trip_responses = {}
+    for route_patterns in route_patterns_map.values():
+        for route_pattern in route_patterns:
+            trip_id = route_pattern.representative_trip_id
+            trip_responses[trip_id] = route_repository._get_trip_and_stops(trip_id)
+
+    with open(path, "w") as recording_file:
+        json.dump(
+            {"routes": get_routes_response, "trips": trip_responses}, recording_file
+        )
+
+
+class MockTransitAPIServer:
+    """
+    A local stand-in for the MBTA API, serving the /routes and /trips endpoints that RouteDataRepository uses.
+
+    Responses come from a recording (see record_transit_api_responses) or from a list of Route objects, for example
+    from generate_synthetic_routes. To load test clients reproducibly, the server can add latency to every response,
+    fail a share of requests with a 500 response, and throttle clients with a 429 response once they exceed a number
+    of requests per time window, like the real API does without an API key.
+
+    Example usage:
+        with MockTransitAPIServer.from_routes(generate_synthetic_routes(), latency_seconds=0.05) as server:
+            routes = RouteDataRepository(server.settings).create_routes_intermediate_data_structure()
+    """
+
+    def __init__(
+        self,
+        routes_response: dict,
+        trip_responses: Dict[str, dict],
+        latency_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[int] = None,
+        rate_limit_window_seconds: float = 60.0,
+        seed: Optional[int] = None,
+        port: int = 0,
+    ):
+        self._routes_response = routes_response
+        self._trip_responses = trip_responses
+        self._latency_seconds = latency_seconds
+        self._error_rate = error_rate
+        self._rate_limit = rate_limit
+        self._rate_limit_window_seconds = rate_limit_window_seconds
+        self._random = random.Random(seed)
+        self._port = port
+
+        self._lock = threading.Lock()
+        self._rate_limit_window_start = time.monotonic()
+        self._rate_limit_window_count = 0
+        self.status_code_counts: Dict[int, int] = {}
+
+        self._http_server: Optional[ThreadingHTTPServer] = None
+        self._server_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_routes(cls, routes: List[Route], **kwargs) -> "MockTransitAPIServer":
+        return cls(
+            create_routes_response(routes), create_trip_responses(routes), **kwargs
+        )
+
+    @classmethod
+    def from_recording(cls, path: str, **kwargs) -> "MockTransitAPIServer":
+        with open(path) as recording_file:
+            recording = json.load(recording_file)
+        return cls(recording["routes"], recording["trips"], **kwargs)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._http_server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def settings(self) -> Settings:
+        return Settings(transit_api_base_url=self.base_url)
+
+    def start(self) -> None:
+        self._http_server = ThreadingHTTPServer(
+            ("127.0.0.1", self._port), self._create_request_handler()
+        )
+        self._http_server.daemon_threads = True
+        self._server_thread = threading.Thread(
+            target=self._http_server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+        self._server_thread.start()
+
+    def stop(self) -> None:
+        self._http_server.shutdown()
+        self._http_server.server_close()
+        self._server_thread.join()
+
+    def __enter__(self) -> "MockTransitAPIServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _get_retry_after_seconds(self) -> Optional[int]:
+        """
+        Count a request against the rate limit.
+
+        Returns:
+            Optional[int]: The number of seconds until the current window ends if the request is over the rate limit,
+            otherwise None.
+        """
+        if self._rate_limit is None:
+            return None
+
+        with self._lock:
+            now = time.monotonic()
+            if now - self._rate_limit_window_start >= self._rate_limit_window_seconds:
+                self._rate_limit_window_start = now
+                self._rate_limit_window_count = 0
+
+            self._rate_limit_window_count += 1
+            if self._rate_limit_window_count <= self._rate_limit:
+                return None
+
+            window_remaining = self._rate_limit_window_seconds - (
+                now - self._rate_limit_window_start
+            )
+            return max(1, round(window_remaining))
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            return self._random.random() < self._error_rate
+
+    def _handle_get(self, path: str) -> Tuple[int, dict, Dict[str, str]]:
+        """
+        Build the response to a GET request.
+
+        Args:
+            path (str): The request path, without the query string.
+
+        Returns:
+            Tuple[int, dict, Dict[str, str]]: The status code, body and extra headers of the response.
+        """
+        retry_after_seconds = self._get_retry_after_seconds()
+        if retry_after_seconds is not None:
+            return (
+                429,
+                {"errors": [{"status": "429", "code": "rate_limited"}]},
+                {"Retry-After": str(retry_after_seconds)},
+            )
+
+        if self._latency_seconds:
+            time.sleep(self._latency_seconds)
+
+        if self._should_fail():
+            return 500, {"errors": [{"status": "500", "code": "internal_error"}]}, {}
+
+        if path == "/routes":
+            return 200, self._routes_response, {}
+
+        trips_path_match = TRIPS_PATH_PATTERN.match(path)
+        if trips_path_match and trips_path_match["trip_id"] in self._trip_responses:
+            return 200, self._trip_responses[trips_path_match["trip_id"]], {}
+
+        return 404, {"errors": [{"status": "404", "code": "not_found"}]}, {}
+
+    def _create_request_handler(self) -> type:
+        mock_server = self
+
+        class MockTransitAPIRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                status_code, body, headers = mock_server._handle_get(
+                    self.path.split("?", 1)[0]
+                )
+                with mock_server._lock:
+                    mock_server.status_code_counts[status_code] = (
+                        mock_server.status_code_counts.get(status_code, 0) + 1
+                    )
+
+                raw_body = json.dumps(body).encode()
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/vnd.api+json")
+                self.send_header("Content-Length", str(len(raw_body)))
+                for header_name, header_value in headers.items():
+                    self.send_header(header_name, header_value)
+                self.end_headers()
+                self.wfile.write(raw_body)
+
+            def log_message(self, format: str, *args) -> None:
+                # Keep load tests quiet
+                ...
+
+        return MockTransitAPIRequestHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve recorded or synthetic transit API responses locally."
+    )
+    parser.add_argument(
+        "--recording", help="JSON file written by record_transit_api_responses"
+    )
+    parser.add_argument("--synthetic-rows", type=int, default=20)
+    parser.add_argument("--synthetic-stops-per-row", type=int, default=50)
+    parser.add_argument("--synthetic-transfer-interval", type=int, default=5)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to every response"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Share of requests answered with a 500",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        help="Requests allowed per window before answering with a 429",
+    )
+    parser.add_argument("--rate-limit-window", type=float, default=60.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    server_options = dict(
+        latency_seconds=args.latency,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        rate_limit_window_seconds=args.rate_limit_window,
+        seed=args.seed,
+        port=args.port,
+    )
+    if args.recording:
+        server = MockTransitAPIServer.from_recording(args.recording, **server_options)
+    else:
+        routes = generate_synthetic_routes(
+            args.synthetic_rows,
+            args.synthetic_stops_per_row,
+            args.synthetic_transfer_interval,
+        )
+        server = MockTransitAPIServer.from_routes(routes, **server_options)
+
+    server.start()
+    print(f"Mock transit API listening on {server.base_url}")
+    try:
+        server._server_thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List
+from typing import AbstractSet, List, Set
 
 from custom_types import RouteID, StopID, RouteName, StopName
 
@@ -36,3 +36,72 @@ class RoutePattern:
 class Stop:
     stop_id: StopID
     name: StopName
+
+
+@dataclass
+class Leg:
+    route_name: RouteName
+    boarding_stop: StopName
+    alighting_stop: StopName
+    num_stops: int
+
+
+@dataclass
+class Itinerary:
+    legs: List[Leg] = field(default_factory=list)
+
+    @property
+    def route_names(self) -> List[RouteName]:
+        return [leg.route_name for leg in self.legs]
+
+    @property
+    def num_transfers(self) -> int:
+        return max(len(self.legs) - 1, 0)
+
+    @classmethod
+    def from_stop_path(
+        cls, stop_path: List[StopName], edge_routes: List[AbstractSet[RouteName]]
+    ) -> Itinerary:
+        """
+        Split a path of stops into legs, riding each route for as many consecutive stops as it serves so that the
+        itinerary has as few transfers as possible for that path.
+
+        Args:
+            stop_path (List[StopName]): The stops of the path, in order.
+            edge_routes (List[AbstractSet[RouteName]]): The routes serving each pair of consecutive stops in the path.
+
+        Returns:
+            Itinerary: The legs of the path. When several routes serve a whole leg, the first by name is used.
+        """
+        legs: List[Leg] = []
+        leg_start = 0
+        leg_routes: Set[RouteName] = set()
+
+        for edge_index, routes in enumerate(edge_routes):
+            if leg_routes & routes:
+                leg_routes &= routes
+                continue
+
+            if leg_routes:
+                legs.append(
+                    Leg(
+                        route_name=min(leg_routes),
+                        boarding_stop=stop_path[leg_start],
+                        alighting_stop=stop_path[edge_index],
+                        num_stops=edge_index - leg_start,
+                    )
+                )
+            leg_start = edge_index
+            leg_routes = set(routes)
+
+        if leg_routes:
+            legs.append(
+                Leg(
+                    route_name=min(leg_routes),
+                    boarding_stop=stop_path[leg_start],
+                    alighting_stop=stop_path[-1],
+                    num_stops=len(edge_routes) - leg_start,
+                )
+            )
+
+        return cls(legs=legs)
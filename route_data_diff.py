@@ -0,0 +1,160 @@
+from dataclasses import dataclass, field
+from typing import List, Dict, Set, Tuple
+
+from custom_types import RouteID, StopID, RouteName, StopName
+from models import Route, RoutePattern
+
+
+@dataclass
+class RouteDataChangeSet:
+    """
+    The difference between two snapshots of route data, as returned by
+    RouteDataRepository.create_routes_intermediate_data_structure.
+
+    Routes and stops are matched by ID and route patterns by route_pattern_id, so a renamed stop shows up as a name
+    change rather than as one stop removed and another added.
+
+    old_routes and new_routes hold only the routes that changed, keyed by RouteID, as they were in the old and new
+    snapshot respectively. They are what a graph needs for a targeted rebuild (see SubwaySystemDictGraph.apply_change_set).
+    """
+
+    routes_added: Set[RouteID] = field(default_factory=set)
+    routes_removed: Set[RouteID] = field(default_factory=set)
+    routes_renamed: Dict[RouteID, Tuple[RouteName, RouteName]] = field(
+        default_factory=dict
+    )
+    patterns_added: Set[str] = field(default_factory=set)
+    patterns_removed: Set[str] = field(default_factory=set)
+    patterns_rerouted: Set[str] = field(default_factory=set)
+    stops_added: Set[StopID] = field(default_factory=set)
+    stops_removed: Set[StopID] = field(default_factory=set)
+    stops_renamed: Dict[StopID, Tuple[StopName, StopName]] = field(default_factory=dict)
+    old_routes: Dict[RouteID, Route] = field(default_factory=dict, repr=False)
+    new_routes: Dict[RouteID, Route] = field(default_factory=dict, repr=False)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.old_routes and not self.new_routes
+
+    @property
+    def changed_route_ids(self) -> Set[RouteID]:
+        return set(self.old_routes) | set(self.new_routes)
+
+
+def _map_stops_by_id(routes: List[Route]) -> Dict[StopID, StopName]:
+    """
+    Collect every stop served by a snapshot of route data.
+
+    Args:
+        routes (List[Route]): A list of Route objects.
+
+    Returns:
+        Dict[StopID, StopName]: A dictionary mapping stop IDs to stop names.
+    """
+    stops_map: Dict[StopID, StopName] = {}
+    for route in routes:
+        for route_pattern in route.route_patterns:
+            for stop in route_pattern.stops:
+                stops_map[stop.stop_id] = stop.name
+    return stops_map
+
+
+def _get_stop_ids(route_pattern: RoutePattern) -> List[StopID]:
+    return [stop.stop_id for stop in route_pattern.stops]
+
+
+def diff_routes(old_routes: List[Route], new_routes: List[Route]) -> RouteDataChangeSet:
+    """
+    Compare two snapshots of route data and collect what changed between them.
+
+    A route counts as changed when it was added, removed or renamed, when one of its route patterns was added, removed
+    or rerouted (its ordered list of stop IDs differs), or when one of its stops was renamed. Only changed routes need
+    to be rebuilt in a graph.
+
+    The time complexity is linear in the total number of stops across both snapshots.
+
+    Args:
+        old_routes (List[Route]): The previous snapshot of route data.
+        new_routes (List[Route]): The current snapshot of route data.
+
+    Returns:
+        RouteDataChangeSet: The change set between the two snapshots.
+    """
+    change_set = RouteDataChangeSet()
+
+    old_routes_map = {route.route_id: route for route in old_routes}
+    new_routes_map = {route.route_id: route for route in new_routes}
+
+    old_stops_map = _map_stops_by_id(old_routes)
+    new_stops_map = _map_stops_by_id(new_routes)
+
+    change_set.stops_added = new_stops_map.keys() - old_stops_map.keys()
+    change_set.stops_removed = old_stops_map.keys() - new_stops_map.keys()
+    for stop_id in old_stops_map.keys() & new_stops_map.keys():
+        if old_stops_map[stop_id] != new_stops_map[stop_id]:
+            change_set.stops_renamed[stop_id] = (
+                old_stops_map[stop_id],
+                new_stops_map[stop_id],
+            )
+
+    change_set.routes_added = new_routes_map.keys() - old_routes_map.keys()
+    change_set.routes_removed = old_routes_map.keys() - new_routes_map.keys()
+    changed_route_ids = change_set.routes_added | change_set.routes_removed
+
+    for route_id in old_routes_map.keys() & new_routes_map.keys():
+        old_route = old_routes_map[route_id]
+        new_route = new_routes_map[route_id]
+
+        if old_route.name != new_route.name:
+            change_set.routes_renamed[route_id] = (old_route.name, new_route.name)
+            changed_route_ids.add(route_id)
+
+        old_patterns_map = {
+            route_pattern.route_pattern_id: route_pattern
+            for route_pattern in old_route.route_patterns
+        }
+        new_patterns_map = {
+            route_pattern.route_pattern_id: route_pattern
+            for route_pattern in new_route.route_patterns
+        }
+
+        patterns_added = new_patterns_map.keys() - old_patterns_map.keys()
+        patterns_removed = old_patterns_map.keys() - new_patterns_map.keys()
+        patterns_rerouted = {
+            route_pattern_id
+            for route_pattern_id in old_patterns_map.keys() & new_patterns_map.keys()
+            if _get_stop_ids(old_patterns_map[route_pattern_id])
+            != _get_stop_ids(new_patterns_map[route_pattern_id])
+        }
+
+        change_set.patterns_added |= patterns_added
+        change_set.patterns_removed |= patterns_removed
+        change_set.patterns_rerouted |= patterns_rerouted
+
+        if patterns_added or patterns_removed or patterns_rerouted:
+            changed_route_ids.add(route_id)
+        elif change_set.stops_renamed and any(
+            stop.stop_id in change_set.stops_renamed
+            for route_pattern in new_route.route_patterns
+            for stop in route_pattern.stops
+        ):
+            changed_route_ids.add(route_id)
+
+    for route_id in change_set.routes_added:
+        change_set.patterns_added |= {
+            route_pattern.route_pattern_id
+            for route_pattern in new_routes_map[route_id].route_patterns
+        }
+    for route_id in change_set.routes_removed:
+        change_set.patterns_removed |= {
+            route_pattern.route_pattern_id
+            for route_pattern in old_routes_map[route_id].route_patterns
+        }
+
+    for route_id in changed_route_ids:
+        if route_id in old_routes_map:
+            change_set.old_routes[route_id] = old_routes_map[route_id]
+        if route_id in new_routes_map:
+            change_set.new_routes[route_id] = new_routes_map[route_id]
+
+    return change_set
@@ -1,5 +1,6 @@
+import asyncio
 import json
-from typing import List, Dict
+from typing import List, Dict, AsyncIterator
 
 import requests
 
@@ -100,6 +101,90 @@ class RouteDataRepository:
 
         return routes
 
+    async def stream_routes(
+        self, max_concurrent_requests: int = 8, max_queued_routes: int = 4
+    ) -> AsyncIterator[Route]:
+        """
+        Asynchronously yield Route objects with data from the /routes and /trips APIs, each as soon as the trips of all
+        of its route patterns have been fetched, instead of waiting for every route like
+        create_routes_intermediate_data_structure does.
+
+        Routes are loaded by a fixed pool of max_concurrent_requests workers, each fetching the /trips of one route at a
+        time in worker threads, with at most max_concurrent_requests /trips requests in flight overall. Finished routes
+        wait in a queue of at most max_queued_routes until the caller consumes them. A worker whose route does not fit
+        in the queue waits before it takes the next route, so a slow consumer holds back the fetching: at most
+        max_queued_routes + max_concurrent_requests routes are loaded ahead of the caller.
+
+        Routes are yielded in the order they finish loading, not in the order of the /routes API response.
+
+        Args:
+            max_concurrent_requests (int): The maximum number of routes being loaded, and of /trips requests in flight,
+                at once.
+            max_queued_routes (int): The maximum number of loaded routes waiting to be consumed.
+
+        Returns:
+            AsyncIterator[Route]: An asynchronous iterator of Route objects.
+        """
+        get_routes_response = await asyncio.to_thread(
+            self._get_subway_routes_and_route_patterns
+        )
+        route_patterns_map = self._map_route_patterns_to_route_id(
+            get_routes_response["included"]
+        )
+
+        request_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        raw_routes_queue: asyncio.Queue = asyncio.Queue()
+        for raw_route in get_routes_response["data"]:
+            raw_routes_queue.put_nowait(raw_route)
+        loaded_routes_queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued_routes)
+
+        async def populate_stops_for_route_pattern(route_pattern: RoutePattern) -> None:
+            async with request_semaphore:
+                get_trips_response = await asyncio.to_thread(
+                    self._get_trip_and_stops, route_pattern.representative_trip_id
+                )
+            route_pattern.stops.extend(
+                self._parse_stops_from_trip_response(get_trips_response)
+            )
+
+        async def load_routes() -> None:
+            while not raw_routes_queue.empty():
+                raw_route = raw_routes_queue.get_nowait()
+
+                # Exceptions are handed to the consumer through the queue so that they are raised where it is waiting.
+                try:
+                    route_id = RouteID(raw_route["id"])
+                    route_patterns = route_patterns_map.get(route_id, [])
+                    await asyncio.gather(
+                        *(
+                            populate_stops_for_route_pattern(route_pattern)
+                            for route_pattern in route_patterns
+                        )
+                    )
+                    route = Route(
+                        route_id=route_id,
+                        name=RouteName(raw_route["attributes"]["long_name"]),
+                        route_patterns=route_patterns,
+                    )
+                except Exception as exception:
+                    route = exception
+                await loaded_routes_queue.put(route)
+
+        num_routes = raw_routes_queue.qsize()
+        load_routes_tasks = [
+            asyncio.create_task(load_routes())
+            for _ in range(min(max_concurrent_requests, num_routes))
+        ]
+        try:
+            for _ in range(num_routes):
+                route = await loaded_routes_queue.get()
+                if isinstance(route, Exception):
+                    raise route
+                yield route
+        finally:
+            for load_routes_task in load_routes_tasks:
+                load_routes_task.cancel()
+
     def _get_subway_routes_and_route_patterns(self) -> dict:
         """
         Fetches subway route data via the /routes API. Filters by routes of types 0 and 1 (light rail and heavy rail)
@@ -177,21 +262,35 @@ class RouteDataRepository:
             get_trips_response = self._get_trip_and_stops(
                 route_pattern.representative_trip_id
             )
+            route_pattern.stops.extend(
+                self._parse_stops_from_trip_response(get_trips_response)
+            )
 
-            # Use 'included' response to populate Stop objects because the stop name is located here in the response.
-            stops_map: Dict[StopID, Stop] = {}
-            for stop_response in get_trips_response["included"]:
-                stop = Stop(
-                    stop_id=StopID(stop_response["id"]),
-                    name=StopName(stop_response["attributes"]["name"]),
-                )
-                stops_map[stop_response["id"]] = stop
+    @staticmethod
+    def _parse_stops_from_trip_response(get_trips_response: dict) -> List[Stop]:
+        """
+        Parses the ordered list of Stop objects out of a /trips API response.
+
+        Args:
+            get_trips_response (dict): The /trips API response as a dictionary, including stops.
+
+        Returns:
+            List[Stop]: The stops of the trip, in order.
+        """
+        # Use 'included' response to populate Stop objects because the stop name is located here in the response.
+        stops_map: Dict[StopID, Stop] = {}
+        for stop_response in get_trips_response["included"]:
+            stop = Stop(
+                stop_id=StopID(stop_response["id"]),
+                name=StopName(stop_response["attributes"]["name"]),
+            )
+            stops_map[stop_response["id"]] = stop
 
-            # This part of the response has the stops in order by ID.
-            for raw_stop in get_trips_response["data"]["relationships"]["stops"][
-                "data"
-            ]:
-                route_pattern.stops.append(stops_map[raw_stop["id"]])
+        # This part of the response has the stops in order by ID.
+        return [
+            stops_map[raw_stop["id"]]
+            for raw_stop in get_trips_response["data"]["relationships"]["stops"]["data"]
+        ]
 
     def _get_trip_and_stops(
         self,
@@ -8,6 +8,7 @@ from exceptions import InvalidSubwaySystemInputException
 class Settings:
     transit_api_base_url: str
     api_key: Optional[str] = None
+    graph_backend: str = "dict"
 
 
 def mbta_settings() -> Settings:
@@ -0,0 +1,175 @@
+from typing import List, Dict, Optional, Tuple
+
+from custom_types import RouteID, StopID, RouteName, StopName
+from models import Route, Leg
+
+
+class StopSequenceIndex:
+    """
+    Positions of stops along every route pattern, built once when route data is loaded.
+
+    RoutePattern.stops is a list, so finding where a stop is on a pattern means scanning it. This index maps
+    (route pattern, stop) to the stop's position instead, so questions like "is B after A on this pattern, and how many
+    stops apart" are dictionary lookups. It also caches each route's longest and shortest pattern length, which
+    Route.max_num_stops and Route.min_num_stops recompute on every access.
+    """
+
+    def __init__(self, routes: List[Route]):
+        # Position of a stop on a route pattern, keyed by (route_pattern_id, stop_id)
+        self._stop_positions: Dict[Tuple[str, StopID], int] = {}
+        # Route patterns serving a stop, with the position of the stop on each, keyed by stop name
+        self._stop_name_positions: Dict[
+            StopName, List[Tuple[RouteID, RouteName, str, int]]
+        ] = {}
+        # Longest and shortest route pattern of a route, in number of stops, keyed by route ID
+        self._route_num_stops: Dict[RouteID, Tuple[int, int]] = {}
+
+        for route in routes:
+            self.add_route(route)
+
+    def add_route(self, route: Route) -> None:
+        """
+        Index the route patterns of a route.
+
+        Args:
+            route (Route): The Route object to index.
+        """
+        for route_pattern in route.route_patterns:
+            for position, stop in enumerate(route_pattern.stops):
+                stop_key = (route_pattern.route_pattern_id, stop.stop_id)
+                if stop_key in self._stop_positions:
+                    # The pattern passes the stop more than once, keep the first time
+                    continue
+
+                self._stop_positions[stop_key] = position
+                if stop.name not in self._stop_name_positions:
+                    self._stop_name_positions[stop.name] = []
+                self._stop_name_positions[stop.name].append(
+                    (
+                        route.route_id,
+                        route.name,
+                        route_pattern.route_pattern_id,
+                        position,
+                    )
+                )
+
+        if route.route_patterns:
+            self._route_num_stops[route.route_id] = (
+                route.max_num_stops,
+                route.min_num_stops,
+            )
+
+    def remove_route(self, route: Route) -> None:
+        """
+        Remove the route patterns of a route from the index.
+
+        Args:
+            route (Route): The Route object to remove, as it was when it was added.
+        """
+        for route_pattern in route.route_patterns:
+            for stop in route_pattern.stops:
+                self._stop_positions.pop(
+                    (route_pattern.route_pattern_id, stop.stop_id), None
+                )
+
+                remaining_positions = [
+                    stop_name_position
+                    for stop_name_position in self._stop_name_positions.get(
+                        stop.name, []
+                    )
+                    if stop_name_position[0] != route.route_id
+                ]
+                if remaining_positions:
+                    self._stop_name_positions[stop.name] = remaining_positions
+                else:
+                    self._stop_name_positions.pop(stop.name, None)
+
+        self._route_num_stops.pop(route.route_id, None)
+
+    def get_stop_position(
+        self, route_pattern_id: str, stop_id: StopID
+    ) -> Optional[int]:
+        """
+        Get the position of a stop on a route pattern.
+
+        Args:
+            route_pattern_id (str): The ID of the route pattern.
+            stop_id (StopID): The ID of the stop.
+
+        Returns:
+            Optional[int]: The position of the stop, starting from 0, or None if the route pattern does not serve it.
+        """
+        return self._stop_positions.get((route_pattern_id, stop_id))
+
+    def get_num_stops_between(
+        self, route_pattern_id: str, from_stop_id: StopID, to_stop_id: StopID
+    ) -> Optional[int]:
+        """
+        Get how many stops apart two stops are on a route pattern.
+
+        Args:
+            route_pattern_id (str): The ID of the route pattern.
+            from_stop_id (StopID): The ID of the first stop.
+            to_stop_id (StopID): The ID of the second stop.
+
+        Returns:
+            Optional[int]: The number of stops from the first stop to the second, positive if the second stop is
+            downstream of the first on the route pattern and negative if it is upstream, or None if the route pattern
+            does not serve both stops.
+        """
+        from_position = self.get_stop_position(route_pattern_id, from_stop_id)
+        to_position = self.get_stop_position(route_pattern_id, to_stop_id)
+
+        if from_position is None or to_position is None:
+            return None
+        return to_position - from_position
+
+    def find_same_route_leg(
+        self, start_stop_name: str, end_stop_name: str
+    ) -> Optional[Leg]:
+        """
+        Find a trip between two stops that needs no transfer, without searching the graph.
+
+        Only the route patterns serving the start stop are checked, and each check is a dictionary lookup. Route
+        patterns are indexed in a single direction and the subway runs both ways, so the end stop may be upstream.
+
+        Args:
+            start_stop_name (str): The name of the starting subway stop.
+            end_stop_name (str): The name of the destination subway stop.
+
+        Returns:
+            Optional[Leg]: The leg with the fewest stops among the routes serving both stops, or None if no route does.
+        """
+        end_stop_positions = {
+            route_pattern_id: position
+            for _, _, route_pattern_id, position in self._stop_name_positions.get(
+                end_stop_name, []
+            )
+        }
+
+        same_route_leg = None
+        for _, route_name, route_pattern_id, position in self._stop_name_positions.get(
+            start_stop_name, []
+        ):
+            if route_pattern_id not in end_stop_positions:
+                continue
+
+            num_stops = abs(end_stop_positions[route_pattern_id] - position)
+            if same_route_leg is None or (num_stops, route_name) < (
+                same_route_leg.num_stops,
+                same_route_leg.route_name,
+            ):
+                same_route_leg = Leg(
+                    route_name=route_name,
+                    boarding_stop=StopName(start_stop_name),
+                    alighting_stop=StopName(end_stop_name),
+                    num_stops=num_stops,
+                )
+
+        return same_route_leg
+
+    def get_max_num_stops(self, route_id: RouteID) -> int:
+        return self._route_num_stops[route_id][0]
+
+    def get_min_num_stops(self, route_id: RouteID) -> int:
+        return self._route_num_stops[route_id][1]
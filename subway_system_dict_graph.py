@@ -1,15 +1,43 @@
+import array
 import collections
-from typing import List, Dict, Set
+from typing import List, Dict, Set, FrozenSet, Iterable, Optional, Tuple
 
 from custom_types import StopName, RouteName
 from exceptions import InvalidSubwayStopInputException
-from models import Route
+from models import Route, Itinerary
+from route_data_diff import RouteDataChangeSet
+from stop_sequence_index import StopSequenceIndex
+
+
+# Stop names by stop number, stop numbers by stop name, each stop's neighbors as stop numbers, and the routes serving
+# the connection to each of those neighbors
+StopPathIndex = Tuple[
+    List[StopName],
+    Dict[StopName, int],
+    List[List[int]],
+    List[List[FrozenSet[RouteName]]],
+]
 
 
 class SubwaySystemDictGraph:
     def __init__(self, routes: List[Route]):
         self._graph = self.transform_routes_list_to_graph(routes)
 
+        # One shared frozen set per combination of routes, since most connections are served by the same few
+        self._frozen_route_sets: Dict[FrozenSet[RouteName], FrozenSet[RouteName]] = {}
+        # Integer-indexed copy of the graph for queries. Every change to the graph publishes a new index in a single
+        # assignment, so a query running in another thread always reads one version of the graph (see
+        # _update_path_index for the parts shared between versions).
+        self._path_index: StopPathIndex = self._build_path_index(
+            self._graph, self._frozen_route_sets
+        )
+
+        self._stop_sequence_index = StopSequenceIndex(routes)
+
+    @property
+    def stop_sequence_index(self) -> StopSequenceIndex:
+        return self._stop_sequence_index
+
     @staticmethod
     def transform_routes_list_to_graph(
         routes: List[Route],
@@ -55,28 +83,129 @@ class SubwaySystemDictGraph:
         subway_graph = {}
 
         for route in routes:
-            for route_pattern in route.route_patterns:
-                prev_stop = None
+            SubwaySystemDictGraph._add_route_to_graph(subway_graph, route)
+
+        return subway_graph
 
-                for stop in route_pattern.stops:
-                    if stop.name not in subway_graph:
-                        subway_graph[stop.name] = {}
+    @staticmethod
+    def _add_route_to_graph(
+        subway_graph: Dict[StopName, Dict[StopName, Set[RouteName]]], route: Route
+    ) -> None:
+        """
+        Add the stops and connections of every route pattern of a route to a dictionary-representation of a subway
+        system graph, in place.
 
-                    if prev_stop is not None:
-                        # Add stops to network_graph in both directions
-                        if prev_stop.name not in subway_graph[stop.name]:
-                            subway_graph[stop.name][prev_stop.name] = {route.name}
-                        else:
-                            subway_graph[stop.name][prev_stop.name].add(route.name)
+        Args:
+            subway_graph (Dict[StopName, Dict[StopName, Set[RouteName]]]): The graph to add the route to.
+            route (Route): The Route object to add.
+        """
+        for route_pattern in route.route_patterns:
+            prev_stop = None
 
-                        if stop.name not in subway_graph[prev_stop.name]:
-                            subway_graph[prev_stop.name][stop.name] = {route.name}
-                        else:
-                            subway_graph[prev_stop.name][stop.name].add(route.name)
+            for stop in route_pattern.stops:
+                if stop.name not in subway_graph:
+                    subway_graph[stop.name] = {}
 
-                    prev_stop = stop
+                if prev_stop is not None:
+                    # Add stops to network_graph in both directions
+                    if prev_stop.name not in subway_graph[stop.name]:
+                        subway_graph[stop.name][prev_stop.name] = {route.name}
+                    else:
+                        subway_graph[stop.name][prev_stop.name].add(route.name)
 
-        return subway_graph
+                    if stop.name not in subway_graph[prev_stop.name]:
+                        subway_graph[prev_stop.name][stop.name] = {route.name}
+                    else:
+                        subway_graph[prev_stop.name][stop.name].add(route.name)
+
+                prev_stop = stop
+
+    @staticmethod
+    def _remove_route_from_graph(
+        subway_graph: Dict[StopName, Dict[StopName, Set[RouteName]]], route: Route
+    ) -> None:
+        """
+        Remove the connections of every route pattern of a route from a dictionary-representation of a subway system
+        graph, in place. Connections no longer served by any route are dropped, and so are stops left with no
+        connections.
+
+        The route must be the same Route object (or an equal one) that was added to the graph, so that its stop names
+        match the ones in the graph.
+
+        Args:
+            subway_graph (Dict[StopName, Dict[StopName, Set[RouteName]]]): The graph to remove the route from.
+            route (Route): The Route object to remove.
+        """
+        touched_stops: Set[StopName] = set()
+
+        for route_pattern in route.route_patterns:
+            prev_stop = None
+
+            for stop in route_pattern.stops:
+                touched_stops.add(stop.name)
+
+                if prev_stop is not None:
+                    for stop_from, stop_to in (
+                        (stop.name, prev_stop.name),
+                        (prev_stop.name, stop.name),
+                    ):
+                        neighbors = subway_graph.get(stop_from, {})
+                        if stop_to in neighbors:
+                            neighbors[stop_to].discard(route.name)
+                            if not neighbors[stop_to]:
+                                del neighbors[stop_to]
+
+                prev_stop = stop
+
+        for stop_name in touched_stops:
+            if stop_name in subway_graph and not subway_graph[stop_name]:
+                del subway_graph[stop_name]
+
+    def add_route(self, route: Route) -> None:
+        """
+        Add a route to the graph without rebuilding it.
+
+        Args:
+            route (Route): The Route object to add.
+        """
+        self._add_route_to_graph(self._graph, route)
+        self._stop_sequence_index.add_route(route)
+        self._update_path_index(self._get_route_stop_names(route))
+
+    def remove_route(self, route: Route) -> None:
+        """
+        Remove a route that was previously added to the graph without rebuilding it.
+
+        Args:
+            route (Route): The Route object to remove, as it was when it was added.
+        """
+        self._remove_route_from_graph(self._graph, route)
+        self._stop_sequence_index.remove_route(route)
+        self._update_path_index(self._get_route_stop_names(route))
+
+    def apply_change_set(self, change_set: RouteDataChangeSet) -> None:
+        """
+        Update the graph in place from the difference between two snapshots of route data, so the cost of a refresh
+        is proportional to the number of changed routes rather than to the size of the subway system.
+
+        Every changed route is removed as it was in the old snapshot and added back as it is in the new one.
+
+        Args:
+            change_set (RouteDataChangeSet): The change set returned by diff_routes for the graph's current routes.
+        """
+        touched_stops: Set[StopName] = set()
+
+        for route in change_set.old_routes.values():
+            self._remove_route_from_graph(self._graph, route)
+            self._stop_sequence_index.remove_route(route)
+            touched_stops |= self._get_route_stop_names(route)
+
+        for route in change_set.new_routes.values():
+            self._add_route_to_graph(self._graph, route)
+            self._stop_sequence_index.add_route(route)
+            touched_stops |= self._get_route_stop_names(route)
+
+        self._update_path_index(touched_stops)
 
     def get_transfer_stops(self) -> Dict[StopName, Set[RouteName]]:
         """
@@ -85,63 +214,262 @@ class SubwaySystemDictGraph:
         Returns:
             Dict[StopName, Set[RouteName]]: A dictionary mapping stop names to sets of route names.
         """
+        stop_names, _, _, edge_routes = self._path_index
         stops_dict: Dict[StopName, Set[RouteName]] = {}
 
-        for stop_to, stop_from in self._graph.items():
-            all_routes_for_stop = set().union(*list(stop_from.values()))
+        for stop_number, stop_routes in enumerate(edge_routes):
+            all_routes_for_stop = set().union(*stop_routes)
             if len(all_routes_for_stop) > 1:
-                stops_dict[stop_to] = all_routes_for_stop
+                stops_dict[stop_names[stop_number]] = all_routes_for_stop
 
         return stops_dict
 
-    def find_routes_between_two_stops(
+    @staticmethod
+    def _get_stop_number(path_index: StopPathIndex, stop_name: str) -> Optional[int]:
+        """
+        Look up the number of a stop in a version of the path index.
+
+        Stops added to the graph later may already be numbered in the shared stop index, but they are past the end of
+        this version's adjacency lists, so they count as not in the graph yet.
+        """
+        _, stop_index, adjacency, _ = path_index
+        stop_number = stop_index.get(stop_name)
+        if stop_number is None or stop_number >= len(adjacency):
+            return None
+        return stop_number
+
+    @staticmethod
+    def _get_route_stop_names(route: Route) -> Set[StopName]:
+        return {
+            stop.name
+            for route_pattern in route.route_patterns
+            for stop in route_pattern.stops
+        }
+
+    @staticmethod
+    def _freeze_route_sets(
+        neighbors: Dict[StopName, Set[RouteName]],
+        frozen_route_sets: Dict[FrozenSet[RouteName], FrozenSet[RouteName]],
+    ) -> List[FrozenSet[RouteName]]:
+        route_sets = []
+        for route_names in neighbors.values():
+            route_set = frozenset(route_names)
+            route_sets.append(frozen_route_sets.setdefault(route_set, route_set))
+        return route_sets
+
+    @staticmethod
+    def _build_path_index(
+        subway_graph: Dict[StopName, Dict[StopName, Set[RouteName]]],
+        frozen_route_sets: Dict[FrozenSet[RouteName], FrozenSet[RouteName]],
+    ) -> StopPathIndex:
+        """
+        Number the stops of a graph and list each stop's neighbors as stop numbers, in the same order as the graph's
+        dictionaries so that searches visit stops in the same order as they would on the graph itself, along with a
+        frozen copy of the routes serving each connection.
+
+        Args:
+            subway_graph (Dict[StopName, Dict[StopName, Set[RouteName]]]): The graph to index.
+            frozen_route_sets (Dict[FrozenSet[RouteName], FrozenSet[RouteName]]): Frozen route sets to share between
+                connections served by the same routes, added to as new combinations are found.
+
+        Returns:
+            StopPathIndex: The stop names by stop number, the stop numbers by stop name, the adjacency lists and the
+            routes serving each connection in the adjacency lists.
+        """
+        stop_names = list(subway_graph)
+        stop_index = {
+            stop_name: stop_number for stop_number, stop_name in enumerate(stop_names)
+        }
+        adjacency = [
+            [stop_index[neighbor] for neighbor in subway_graph[stop_name]]
+            for stop_name in stop_names
+        ]
+        edge_routes = [
+            SubwaySystemDictGraph._freeze_route_sets(
+                subway_graph[stop_name], frozen_route_sets
+            )
+            for stop_name in stop_names
+        ]
+        return stop_names, stop_index, adjacency, edge_routes
+
+    def _update_path_index(self, touched_stops: Iterable[StopName]) -> None:
+        """
+        Publish a new path index after the stops in touched_stops gained or lost connections in the graph.
+
+        The adjacency lists of the current index are copied, not their rows, and only the rows of touched stops are
+        rebuilt, so the cost is a copy of one reference per stop plus the connections of the touched stops rather than
+        a full rebuild. New stops are appended to the stop names and stop index shared with earlier versions, which
+        is safe because an earlier version ignores stop numbers past the end of its own adjacency lists (see
+        _get_stop_number). Removing a stop renumbers another one, so those two are copied first when a stop leaves the
+        graph. The removed stop gives its number to the last numbered stop, so no other stop is renumbered.
+
+        Args:
+            touched_stops (Iterable[StopName]): The stops of the routes that were added to or removed from the graph.
+        """
+        touched_stops = set(touched_stops)
+        stop_names, stop_index, adjacency, edge_routes = self._path_index
+        adjacency = list(adjacency)
+        edge_routes = list(edge_routes)
+        if any(
+            stop_name in stop_index and stop_name not in self._graph
+            for stop_name in touched_stops
+        ):
+            stop_names = list(stop_names)
+            stop_index = dict(stop_index)
+
+        rows_to_rebuild: Set[StopName] = set()
+        for stop_name in touched_stops:
+            if stop_name in self._graph:
+                if stop_name not in stop_index:
+                    stop_index[stop_name] = len(stop_names)
+                    stop_names.append(stop_name)
+                    adjacency.append([])
+                    edge_routes.append([])
+                rows_to_rebuild.add(stop_name)
+            elif stop_name in stop_index:
+                stop_number = stop_index.pop(stop_name)
+                last_stop_name = stop_names.pop()
+                last_adjacency = adjacency.pop()
+                last_edge_routes = edge_routes.pop()
+                if last_stop_name != stop_name:
+                    stop_names[stop_number] = last_stop_name
+                    stop_index[last_stop_name] = stop_number
+                    adjacency[stop_number] = last_adjacency
+                    edge_routes[stop_number] = last_edge_routes
+                    # The moved stop and its neighbors refer to it by its old number
+                    rows_to_rebuild.add(last_stop_name)
+                    rows_to_rebuild.update(self._graph.get(last_stop_name, {}))
+
+        for stop_name in rows_to_rebuild:
+            if stop_name not in stop_index:
+                continue
+            stop_number = stop_index[stop_name]
+            neighbors = self._graph[stop_name]
+            adjacency[stop_number] = [stop_index[neighbor] for neighbor in neighbors]
+            edge_routes[stop_number] = self._freeze_route_sets(
+                neighbors, self._frozen_route_sets
+            )
+
+        self._path_index = (stop_names, stop_index, adjacency, edge_routes)
+
+    def _find_shortest_stop_path(
         self, start_stop_name: str, end_stop_name: str
-    ) -> List[Set[RouteName]]:
+    ) -> Optional[Tuple[List[StopName], List[FrozenSet[RouteName]]]]:
         """
-        Use Breadth-First Search (BFS) to find all combinations of routes between two subway stops.
+        Use Breadth-First Search (BFS) to find a path with the fewest stops between two subway stops.
 
-        The time complexity of this algorithm is liner O(V + E), where V = number of stops and E = number of connections
-        in the subway graph. This is because in the worst case, the algorithm checks all possible stops and connections
-        before it finds a set of routes between the start and end stop.
+        Instead of carrying the path so far in every queue entry, the search records only the stop number it reached
+        each stop from, in a single integer array, and walks that array back from the end stop once it is found.
+
+        The time complexity of this algorithm is linear O(V + E), where V = number of stops and E = number of
+        connections in the subway graph, and the extra memory is one integer per stop.
 
         Args:
             start_stop_name (str): The name of the starting subway stop.
             end_stop_name (str): The name of the destination subway stop.
 
         Returns:
-            List[Set[RouteName]]: A list of sets, each containing route names representing possible connections
-            between the start and end stops.
+            Optional[Tuple[List[StopName], List[FrozenSet[RouteName]]]]: The stops of the path in order, including both
+            ends, and the routes serving each connection along it, or None if the stops are not connected.
         """
-        if start_stop_name not in self._graph:
+        # Read the index once, so the whole search uses the same version of it even if the graph changes meanwhile
+        path_index = self._path_index
+        stop_names, _, adjacency, edge_routes = path_index
+
+        start_stop = self._get_stop_number(path_index, start_stop_name)
+        if start_stop is None:
             raise InvalidSubwayStopInputException(
                 f"'{start_stop_name}' is not a valid subway stop."
             )
 
-        if end_stop_name not in self._graph:
+        end_stop = self._get_stop_number(path_index, end_stop_name)
+        if end_stop is None:
             raise InvalidSubwayStopInputException(
                 f"'{end_stop_name}' is not a valid subway stop."
             )
 
-        all_routes: List[Set[RouteName]] = []
+        # The stop number each stop was first reached from, or -1 if it has not been reached yet
+        predecessors = array.array("i", [-1]) * len(adjacency)
+        predecessors[start_stop] = start_stop
+
+        queue = collections.deque([start_stop])
+        while queue:
+            current_stop = queue.popleft()
+            if current_stop == end_stop:
+                break
 
-        # Keep track of visited stops to avoid cycles
-        visited = set()
+            for neighbor_stop in adjacency[current_stop]:
+                if predecessors[neighbor_stop] < 0:
+                    predecessors[neighbor_stop] = current_stop
+                    queue.append(neighbor_stop)
 
-        # Keep stops to visit in a queue, represented by a tuple of stop name and a set of routes
-        queue = collections.deque()
-        queue.append((start_stop_name, set()))
+        if predecessors[end_stop] < 0:
+            return None
 
-        while queue:
-            current_stop, current_routes = queue.popleft()
-            visited.add(current_stop)
-
-            if current_stop == end_stop_name:
-                all_routes.append(current_routes)
-            else:
-                neighbors = self._graph.get(current_stop, {})
-                for neighbor_stops, neighbor_routes in neighbors.items():
-                    if neighbor_stops not in visited:
-                        new_routes = current_routes.union(neighbor_routes)
-                        queue.append((neighbor_stops, new_routes))
-
-        return all_routes
+        stop_path = [end_stop]
+        while stop_path[-1] != start_stop:
+            stop_path.append(predecessors[stop_path[-1]])
+        stop_path.reverse()
+
+        return [stop_names[stop] for stop in stop_path], [
+            edge_routes[stop_from][adjacency[stop_from].index(stop_to)]
+            for stop_from, stop_to in zip(stop_path, stop_path[1:])
+        ]
+
+    def find_routes_between_two_stops(
+        self, start_stop_name: str, end_stop_name: str
+    ) -> List[Set[RouteName]]:
+        """
+        Find the routes serving a path with the fewest stops between two subway stops.
+
+        Args:
+            start_stop_name (str): The name of the starting subway stop.
+            end_stop_name (str): The name of the destination subway stop.
+
+        Returns:
+            List[Set[RouteName]]: A list with a single set of every route name serving a connection along the path, or
+            an empty list if the stops are not connected.
+        """
+        shortest_stop_path = self._find_shortest_stop_path(
+            start_stop_name, end_stop_name
+        )
+        if shortest_stop_path is None:
+            return []
+
+        _, edge_routes = shortest_stop_path
+        return [set().union(*edge_routes)]
+
+    def find_itinerary_between_two_stops(
+        self, start_stop_name: str, end_stop_name: str
+    ) -> Optional[Itinerary]:
+        """
+        Find an itinerary between two subway stops, as ordered legs with the route to ride, the stops to board and
+        alight at, and the number of stops ridden.
+
+        When a single route serves both stops, the itinerary is that one leg, answered from the stop sequence index
+        without searching the graph. Otherwise it follows a path with the fewest stops.
+
+        Args:
+            start_stop_name (str): The name of the starting subway stop.
+            end_stop_name (str): The name of the destination subway stop.
+
+        Returns:
+            Optional[Itinerary]: The itinerary, or None if the stops are not connected.
+        """
+        if (
+            start_stop_name != end_stop_name
+            and self._get_stop_number(self._path_index, start_stop_name) is not None
+        ):
+            same_route_leg = self._stop_sequence_index.find_same_route_leg(
+                start_stop_name, end_stop_name
+            )
+            if same_route_leg is not None:
+                return Itinerary(legs=[same_route_leg])
+
+        shortest_stop_path = self._find_shortest_stop_path(
+            start_stop_name, end_stop_name
+        )
+        if shortest_stop_path is None:
+            return None
+
+        return Itinerary.from_stop_path(*shortest_stop_path)
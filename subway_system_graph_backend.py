@@ -0,0 +1,147 @@
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import List, Dict, Set, Callable, Optional, Protocol, Tuple, Type
+
+from custom_types import StopName, RouteName
+from exceptions import InvalidGraphBackendException
+from models import Route, Itinerary
+from stop_sequence_index import StopSequenceIndex
+
+
+class SubwaySystemGraphBackend(Protocol):
+    """
+    The interface every subway system graph implementation provides, so callers like main.py can swap one for another.
+
+    Conformance rules shared by every backend (see tests/test_subway_system_graph_backend.py):
+      - Stops are identified by name.
+      - find_routes_between_two_stops raises InvalidSubwayStopInputException for an unknown stop, returns an empty list
+        when the stops are not connected, and otherwise returns the routes of a shortest path (fewest stops) first.
+      - find_itinerary_between_two_stops raises the same exception and returns None when the stops are not connected.
+        When one route serves both stops it returns that single leg (see StopSequenceIndex.find_same_route_leg),
+        and otherwise the legs of a shortest path (see Itinerary.from_stop_path).
+      - stop_sequence_index is the StopSequenceIndex of the graph's routes, so callers can reuse it (i.e. for the stop
+        counts of each route) instead of indexing the routes again.
+    """
+
+    def __init__(self, routes: List[Route]):
+        ...
+
+    @property
+    def stop_sequence_index(self) -> StopSequenceIndex:
+        ...
+
+    def get_transfer_stops(self) -> Dict[StopName, Set[RouteName]]:
+        ...
+
+    def find_routes_between_two_stops(
+        self, start_stop_name: str, end_stop_name: str
+    ) -> List[Set[RouteName]]:
+        ...
+
+    def find_itinerary_between_two_stops(
+        self, start_stop_name: str, end_stop_name: str
+    ) -> Optional[Itinerary]:
+        ...
+
+
+def _dict_graph_backend() -> Type[SubwaySystemGraphBackend]:
+    from subway_system_dict_graph import SubwaySystemDictGraph
+
+    return SubwaySystemDictGraph
+
+
+def _networkx_graph_backend() -> Type[SubwaySystemGraphBackend]:
+    from subway_system_networkx_graph import SubwaySystemGraph
+
+    return SubwaySystemGraph
+
+
+# Backends are imported on first use, so that selecting one does not require the dependencies of the others
+GRAPH_BACKEND_LOADERS: Dict[str, Callable[[], Type[SubwaySystemGraphBackend]]] = {
+    "dict": _dict_graph_backend,
+    "networkx": _networkx_graph_backend,
+}
+
+
+def register_graph_backend(
+    name: str, loader: Callable[[], Type[SubwaySystemGraphBackend]]
+) -> None:
+    """
+    Make a graph backend selectable by name.
+
+    Args:
+        name (str): The name to select the backend by.
+        loader (Callable[[], Type[SubwaySystemGraphBackend]]): A function returning the backend class.
+    """
+    GRAPH_BACKEND_LOADERS[name] = loader
+
+
+def get_graph_backend(name: str) -> Type[SubwaySystemGraphBackend]:
+    loader = GRAPH_BACKEND_LOADERS.get(name, None)
+
+    if not loader:
+        raise InvalidGraphBackendException(
+            f"'{name}' is not a supported graph backend."
+        )
+    return loader()
+
+
+@dataclass
+class GraphBackendBenchmark:
+    backend_name: str
+    build_time_seconds: float
+    mean_query_time_seconds: float
+    max_query_time_seconds: float
+    memory_bytes: int
+
+
+def benchmark_graph_backend(
+    name: str, routes: List[Route], stop_pairs: List[Tuple[str, str]]
+) -> GraphBackendBenchmark:
+    """
+    Measure how long a graph backend takes to build from a list of routes and to answer queries, and how much memory
+    the built graph holds on to.
+
+    Memory is measured with tracemalloc as the memory still allocated once the graph is built, so it counts the graph
+    itself and not temporary allocations made while building it.
+
+    Args:
+        name (str): The name of the graph backend.
+        routes (List[Route]): A list of Route objects to build the graph from.
+        stop_pairs (List[Tuple[str, str]]): Pairs of stop names to query routes between.
+
+    Returns:
+        GraphBackendBenchmark: The build time, query latencies and memory footprint of the backend.
+    """
+    backend = get_graph_backend(name)
+
+    # Leave tracing running if the caller had already started it
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        memory_before_build, _ = tracemalloc.get_traced_memory()
+        build_start = time.perf_counter()
+        graph = backend(routes)
+        build_time_seconds = time.perf_counter() - build_start
+        memory_after_build, _ = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    query_times = []
+    for start_stop_name, end_stop_name in stop_pairs:
+        query_start = time.perf_counter()
+        graph.find_routes_between_two_stops(start_stop_name, end_stop_name)
+        query_times.append(time.perf_counter() - query_start)
+
+    return GraphBackendBenchmark(
+        backend_name=name,
+        build_time_seconds=build_time_seconds,
+        mean_query_time_seconds=sum(query_times) / len(query_times)
+        if query_times
+        else 0.0,
+        max_query_time_seconds=max(query_times, default=0.0),
+        memory_bytes=memory_after_build - memory_before_build,
+    )
@@ -0,0 +1,94 @@
+import asyncio
+from typing import List, Dict, Optional, Set
+
+from custom_types import RouteID
+from models import Route
+from route_data_repository import RouteDataRepository
+from subway_system_dict_graph import SubwaySystemDictGraph
+
+
+class SubwaySystemGraphPipeline:
+    """
+    Builds a SubwaySystemDictGraph route by route while route data is still being fetched.
+
+    Each route is added to the graph as soon as RouteDataRepository.stream_routes yields it, so the graph can answer
+    queries between stops of already loaded routes while the rest are still loading. Queries are plain method calls on
+    the event loop's thread, so they always see the graph between two whole routes, never halfway through adding one.
+    """
+
+    def __init__(
+        self,
+        route_repository: RouteDataRepository,
+        max_concurrent_requests: int = 8,
+        max_queued_routes: int = 4,
+    ):
+        self._route_repository = route_repository
+        self._max_concurrent_requests = max_concurrent_requests
+        self._max_queued_routes = max_queued_routes
+        self._route_loaded_events: Dict[RouteID, asyncio.Event] = {}
+        self._loaded_route_ids: Set[RouteID] = set()
+        self._is_finished = False
+        self._run_exception: Optional[BaseException] = None
+
+        self.graph = SubwaySystemDictGraph(routes=[])
+        self.routes: List[Route] = []
+
+    @property
+    def loaded_route_ids(self) -> Set[RouteID]:
+        return set(self._loaded_route_ids)
+
+    def _get_route_loaded_event(self, route_id: RouteID) -> asyncio.Event:
+        if route_id not in self._route_loaded_events:
+            self._route_loaded_events[route_id] = asyncio.Event()
+            if self._is_finished:
+                self._route_loaded_events[route_id].set()
+        return self._route_loaded_events[route_id]
+
+    async def wait_for_route(self, route_id: RouteID) -> bool:
+        """
+        Wait until a route has been added to the graph, or until run() has ended without adding it.
+
+        Args:
+            route_id (RouteID): The ID of the route to wait for.
+
+        Returns:
+            bool: True if the route was added to the graph, False if run() finished without finding it.
+
+        Raises:
+            The exception run() failed with, if it failed before adding the route.
+        """
+        await self._get_route_loaded_event(route_id).wait()
+
+        if route_id in self._loaded_route_ids:
+            return True
+        if self._run_exception is not None:
+            raise self._run_exception
+        return False
+
+    async def run(self) -> List[Route]:
+        """
+        Fetch every route and add it to the graph as it arrives.
+
+        When run() ends, successfully or not, every caller still in wait_for_route is released.
+
+        Returns:
+            List[Route]: A list of Route objects, in the order they were loaded.
+        """
+        try:
+            async for route in self._route_repository.stream_routes(
+                max_concurrent_requests=self._max_concurrent_requests,
+                max_queued_routes=self._max_queued_routes,
+            ):
+                self.graph.add_route(route)
+                self.routes.append(route)
+                self._loaded_route_ids.add(route.route_id)
+                self._get_route_loaded_event(route.route_id).set()
+        except BaseException as exception:
+            self._run_exception = exception
+            raise
+        finally:
+            self._is_finished = True
+            for route_loaded_event in self._route_loaded_events.values():
+                route_loaded_event.set()
+
+        return self.routes
@@ -0,0 +1,182 @@
+import collections
+import collections.abc
+import sys
+import threading
+from concurrent.futures import Future
+from typing import List, Dict, Callable, Tuple
+
+from route_data_repository import RouteDataRepository
+from settings import get_settings
+from subway_system_graph_backend import SubwaySystemGraphBackend, get_graph_backend
+
+DEFAULT_MEMORY_BUDGET_BYTES = 512 * 1024 * 1024
+
+
+def load_subway_system_graph(subway_system: str) -> SubwaySystemGraphBackend:
+    """
+    Fetch the route data of a subway system and build its graph with the backend named in its settings.
+
+    Args:
+        subway_system (str): The acronym of the subway system.
+
+    Returns:
+        SubwaySystemGraphBackend: The graph of the subway system.
+    """
+    settings = get_settings(subway_system)
+    routes = RouteDataRepository(settings).create_routes_intermediate_data_structure()
+    return get_graph_backend(settings.graph_backend)(routes)
+
+
+def estimate_memory_footprint(obj: object) -> int:
+    """
+    Estimate the memory held by an object and everything reachable from it, in bytes.
+
+    Walks containers (dicts, lists, tuples, sets) and object attributes, counting every object once even when it is
+    shared (i.e. a stop name used as a key in several dictionaries). Classes, functions and modules are not counted.
+
+    Args:
+        obj (object): The object to measure.
+
+    Returns:
+        int: The estimated number of bytes.
+    """
+    seen_ids = set()
+    total_bytes = 0
+    stack = [obj]
+
+    while stack:
+        current = stack.pop()
+        if id(current) in seen_ids or isinstance(
+            current, (type, collections.abc.Callable, type(sys))
+        ):
+            continue
+        seen_ids.add(id(current))
+        total_bytes += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        else:
+            if hasattr(current, "__dict__"):
+                stack.append(vars(current))
+            for slot in getattr(type(current), "__slots__", ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+
+    return total_bytes
+
+
+class SubwaySystemGraphRegistry:
+    """
+    A process-wide, thread-safe cache of subway system graphs, keyed by subway system acronym.
+
+    A graph is loaded the first time it is requested. When several threads request a graph that is not loaded yet, only
+    the first one loads it and the others wait for that load, so an agency's API is never hit twice for the same graph.
+
+    The same graph object is shared by every caller, so callers must treat it as read-only.
+
+    Each graph's memory footprint is measured once it is loaded. When the total goes over the memory budget, the least
+    recently requested graphs are evicted until it fits again. The graph that was just loaded is never evicted, even if
+    it alone is over the budget.
+    """
+
+    def __init__(
+        self,
+        memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET_BYTES,
+        load_graph: Callable[
+            [str], SubwaySystemGraphBackend
+        ] = load_subway_system_graph,
+        measure_graph: Callable[[object], int] = estimate_memory_footprint,
+    ):
+        self._memory_budget_bytes = memory_budget_bytes
+        self._load_graph = load_graph
+        self._measure_graph = measure_graph
+
+        self._lock = threading.Lock()
+        # Loaded graphs and their memory footprints, least recently requested first
+        self._graphs: collections.OrderedDict[
+            str, Tuple[SubwaySystemGraphBackend, int]
+        ] = collections.OrderedDict()
+        self._loading: Dict[str, Future] = {}
+        self._memory_usage_bytes = 0
+
+    @property
+    def memory_usage_bytes(self) -> int:
+        return self._memory_usage_bytes
+
+    @property
+    def loaded_subway_systems(self) -> List[str]:
+        with self._lock:
+            return list(self._graphs)
+
+    def get_graph(self, subway_system: str) -> SubwaySystemGraphBackend:
+        """
+        Get the graph of a subway system, loading it if it is not loaded yet.
+
+        Args:
+            subway_system (str): The acronym of the subway system.
+
+        Returns:
+            SubwaySystemGraphBackend: The shared, read-only graph of the subway system.
+        """
+        with self._lock:
+            if subway_system in self._graphs:
+                self._graphs.move_to_end(subway_system)
+                return self._graphs[subway_system][0]
+
+            load_future = self._loading.get(subway_system)
+            is_loader = load_future is None
+            if is_loader:
+                load_future = Future()
+                self._loading[subway_system] = load_future
+
+        if not is_loader:
+            return load_future.result()
+
+        # Load outside the lock, so that requests for other subway systems are not blocked
+        try:
+            graph = self._load_graph(subway_system)
+            graph_size_bytes = self._measure_graph(graph)
+        except BaseException as exception:
+            with self._lock:
+                del self._loading[subway_system]
+            load_future.set_exception(exception)
+            raise
+
+        with self._lock:
+            del self._loading[subway_system]
+            self._graphs[subway_system] = (graph, graph_size_bytes)
+            self._memory_usage_bytes += graph_size_bytes
+            self._evict_least_recently_used()
+        load_future.set_result(graph)
+
+        return graph
+
+    def _evict_least_recently_used(self) -> None:
+        """
+        Evict the least recently requested graphs until the memory usage fits in the budget. Must be called with the
+        lock held.
+        """
+        while (
+            self._memory_usage_bytes > self._memory_budget_bytes
+            and len(self._graphs) > 1
+        ):
+            _, (_, graph_size_bytes) = self._graphs.popitem(last=False)
+            self._memory_usage_bytes -= graph_size_bytes
+
+    def evict(self, subway_system: str) -> None:
+        """
+        Evict the graph of a subway system, i.e. so that it is reloaded with fresh route data on its next request.
+
+        Args:
+            subway_system (str): The acronym of the subway system.
+        """
+        with self._lock:
+            if subway_system in self._graphs:
+                _, graph_size_bytes = self._graphs.pop(subway_system)
+                self._memory_usage_bytes -= graph_size_bytes
+
+
+subway_system_graph_registry = SubwaySystemGraphRegistry()
@@ -1,22 +1,33 @@
-from typing import List
+from typing import List, Dict, Set, Optional
 import networkx as nx
 from networkx import Graph
 
-from models import Route
+from custom_types import StopName, RouteName
+from exceptions import InvalidSubwayStopInputException
+from models import Route, Itinerary
+from stop_sequence_index import StopSequenceIndex
 
 
 class SubwaySystemGraph:
     def __init__(self, routes: List[Route]):
         self._graph = self._transform_routes_list_to_graph(routes)
+        self._stop_sequence_index = StopSequenceIndex(routes)
+
+    @property
+    def stop_sequence_index(self) -> StopSequenceIndex:
+        return self._stop_sequence_index
 
     @staticmethod
     def _transform_routes_list_to_graph(routes: List[Route]) -> Graph:
         """
         Use the networkx library to turn a list of routes into a graph where nodes are stop names and edges
-        are two adjacent stops with route name as an attribute.
+        are two adjacent stops with the set of route names serving them as an attribute.
+
+        A set is used instead of a single route name so that stops served by several routes (i.e. Park Street to
+        Boylston on every Green Line branch) keep all of them without needing a MultiGraph.
 
         Example nodes in returned graph:  [('Alewife', {}), ('Davis', {}), ('Porter', {}), ...]
-        Example edges in returned graph:  [('Alewife', 'Davis', {'route': 'Red Line'}), ('Davis', 'Porter', {'route': 'Red Line'}), ...]
+        Example edges in returned graph:  [('Alewife', 'Davis', {'routes': {'Red Line'}}), ('Davis', 'Porter', {'routes': {'Red Line'}}), ...]
         """
         network_graph = nx.Graph()
 
@@ -29,42 +40,117 @@ class SubwaySystemGraph:
                         network_graph.add_node(stop.name)
 
                     if prev_stop is not None:
-                        # Add stops to network_graph in both directions
-                        network_graph.add_edges_from(
-                            [(stop.name, prev_stop.name), (prev_stop.name, stop.name)],
-                            route=route.name,
-                        )
+                        if network_graph.has_edge(prev_stop.name, stop.name):
+                            network_graph.edges[prev_stop.name, stop.name][
+                                "routes"
+                            ].add(route.name)
+                        else:
+                            network_graph.add_edge(
+                                prev_stop.name, stop.name, routes={route.name}
+                            )
 
                     prev_stop = stop
 
         return network_graph
 
-    def get_transfer_stops(self):
-        # TODO
-        ...
+    def get_transfer_stops(self) -> Dict[StopName, Set[RouteName]]:
+        """
+        Find stops that serve multiple subway routes.
+
+        Returns:
+            Dict[StopName, Set[RouteName]]: A dictionary mapping stop names to sets of route names.
+        """
+        stops_dict: Dict[StopName, Set[RouteName]] = {}
+
+        for stop in self._graph.nodes:
+            all_routes_for_stop = set().union(
+                *(routes for _, _, routes in self._graph.edges(stop, data="routes"))
+            )
+            if len(all_routes_for_stop) > 1:
+                stops_dict[stop] = all_routes_for_stop
+
+        return stops_dict
 
     def find_routes_between_two_stops(
         self, start_stop_name: str, end_stop_name: str
-    ) -> List[str]:
+    ) -> List[Set[RouteName]]:
         """
-        Finds the list of subway route names one will need to use to travel between two stops in the subway system.
+        Finds the set of subway route names one will need to use to travel between two stops in the subway system.
 
         Use the networkx 'shortest_path()' function to get a list of edges for the shortest path between two stops.
         Match those edges with the graph's edges to get the route attributes of those edges.
 
-        The default algorithm for shortest_path is dijkstra's.
+        The graph is unweighted, so shortest_path uses Breadth-First Search.
+
+        Returns:
+            List[Set[RouteName]]: A list with a single set of route names for the shortest path, or an empty list if
+            the stops are not connected.
         """
-        stops_in_shortest_path = nx.shortest_path(
-            self._graph, start_stop_name, end_stop_name
+        stops_in_shortest_path = self._find_shortest_stop_path(
+            start_stop_name, end_stop_name
         )
+        if stops_in_shortest_path is None:
+            return []
 
-        routes_travelled = []
+        routes_travelled: Set[RouteName] = set()
         shortest_path_graph = nx.path_graph(stops_in_shortest_path)
 
         for from_node, to_node in shortest_path_graph.edges():
-            route = self._graph.edges[from_node, to_node]["route"]
+            routes_travelled |= self._graph.edges[from_node, to_node]["routes"]
+
+        return [routes_travelled]
+
+    def find_itinerary_between_two_stops(
+        self, start_stop_name: str, end_stop_name: str
+    ) -> Optional[Itinerary]:
+        """
+        Finds an itinerary between two stops in the subway system, as ordered legs with the route to ride, the stops
+        to board and alight at, and the number of stops ridden.
+
+        When a single route serves both stops, the itinerary is that one leg, answered from the stop sequence index
+        without searching the graph. Otherwise it follows the shortest path.
 
-            if route not in routes_travelled:
-                routes_travelled.append(route)
+        Returns:
+            Optional[Itinerary]: The itinerary, or None if the stops are not connected.
+        """
+        if start_stop_name != end_stop_name and start_stop_name in self._graph:
+            same_route_leg = self._stop_sequence_index.find_same_route_leg(
+                start_stop_name, end_stop_name
+            )
+            if same_route_leg is not None:
+                return Itinerary(legs=[same_route_leg])
+
+        stops_in_shortest_path = self._find_shortest_stop_path(
+            start_stop_name, end_stop_name
+        )
+        if stops_in_shortest_path is None:
+            return None
 
-        return routes_travelled
+        shortest_path_graph = nx.path_graph(stops_in_shortest_path)
+        return Itinerary.from_stop_path(
+            stops_in_shortest_path,
+            [
+                self._graph.edges[from_node, to_node]["routes"]
+                for from_node, to_node in shortest_path_graph.edges()
+            ],
+        )
+
+    def _find_shortest_stop_path(
+        self, start_stop_name: str, end_stop_name: str
+    ) -> Optional[List[StopName]]:
+        """
+        Use the networkx 'shortest_path()' function to get the stops of the shortest path between two stops.
+
+        Returns:
+            Optional[List[StopName]]: The stops of the path in order, or None if the stops are not connected.
+        """
+        for stop_name in (start_stop_name, end_stop_name):
+            if stop_name not in self._graph:
+                raise InvalidSubwayStopInputException(
+                    f"'{stop_name}' is not a valid subway stop."
+                )
+
+        try:
+            return nx.shortest_path(self._graph, start_stop_name, end_stop_name)
+        except nx.NetworkXNoPath:
+            return None
@@ -0,0 +1,31 @@
+GRAPH_BACKEND_BENCHMARK_PROPERTY = "graph_backend_benchmark"
+
+
+def pytest_terminal_summary(terminalreporter):
+    """
+    Print the graph backend benchmarks recorded by tests/test_subway_system_graph_backend.py as a table.
+    """
+    benchmarks = [
+        value
+        for report in terminalreporter.stats.get("passed", [])
+        for name, value in report.user_properties
+        if name == GRAPH_BACKEND_BENCHMARK_PROPERTY
+    ]
+    if not benchmarks:
+        return
+
+    terminalreporter.section("graph backend benchmarks")
+    terminalreporter.line(
+        f"{'network':<18}{'backend':<10}{'build (ms)':>12}{'mean query (ms)':>17}"
+        f"{'max query (ms)':>16}{'memory (KiB)':>14}"
+    )
+    for benchmark in sorted(
+        benchmarks, key=lambda b: (b["network_name"], b["backend_name"])
+    ):
+        terminalreporter.line(
+            f"{benchmark['network_name']:<18}{benchmark['backend_name']:<10}"
+            f"{benchmark['build_time_seconds'] * 1000:>12.2f}"
+            f"{benchmark['mean_query_time_seconds'] * 1000:>17.3f}"
+            f"{benchmark['max_query_time_seconds'] * 1000:>16.3f}"
+            f"{benchmark['memory_bytes'] / 1024:>14.1f}"
+        )
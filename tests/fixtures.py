@@ -0,0 +1,101 @@
+from custom_types import RouteID, RouteName, StopID, StopName
+from models import RoutePattern, Route, Stop
+
+ROUTES = [
+    Route(
+        route_id=RouteID("Red"),
+        name=RouteName("Red Line"),
+        route_patterns=[
+            RoutePattern(
+                route_pattern_id="Red-1-0",
+                route_pattern_name="Alewife - Ashmont",
+                representative_trip_id="canonical-Red-C2-0",
+                stops=[
+                    Stop(stop_id=StopID("70061"), name=StopName("Alewife")),
+                    Stop(stop_id=StopID("70075"), name=StopName("Park Street")),
+                    Stop(stop_id=StopID("70077"), name=StopName("Downtown Crossing")),
+                    Stop(stop_id=StopID("70079"), name=StopName("South Station")),
+                    Stop(stop_id=StopID("70087"), name=StopName("Savin Hill")),
+                    Stop(stop_id=StopID("70089"), name=StopName("Fields Corner")),
+                    Stop(stop_id=StopID("70091"), name=StopName("Shawmut")),
+                    Stop(stop_id=StopID("70093"), name=StopName("Ashmont")),
+                ],
+            ),
+            RoutePattern(
+                route_pattern_id="Red-3-0",
+                route_pattern_name="Alewife - Braintree",
+                representative_trip_id="canonical-Red-C1-0",
+                stops=[
+                    Stop(stop_id=StopID("70061"), name=StopName("Alewife")),
+                    Stop(stop_id=StopID("70075"), name=StopName("Park Street")),
+                    Stop(stop_id=StopID("70077"), name=StopName("Downtown Crossing")),
+                    Stop(stop_id=StopID("70079"), name=StopName("South Station")),
+                    Stop(stop_id=StopID("70097"), name=StopName("North Quincy")),
+                    Stop(stop_id=StopID("70099"), name=StopName("Wollaston")),
+                    Stop(stop_id=StopID("70101"), name=StopName("Quincy Center")),
+                    Stop(stop_id=StopID("70103"), name=StopName("Quincy Adams")),
+                    Stop(stop_id=StopID("70105"), name=StopName("Braintree")),
+                ],
+            ),
+        ],
+    ),
+    Route(
+        route_id=RouteID("Green-B"),
+        name=RouteName("Green Line B"),
+        route_patterns=[
+            RoutePattern(
+                route_pattern_id="Green-B-812-0",
+                route_pattern_name="Government Center - Boston College",
+                representative_trip_id="canonical-Green-B-C1-0",
+                stops=[
+                    Stop(stop_id=StopID("70196"), name=StopName("Park Street")),
+                    Stop(stop_id=StopID("70159"), name=StopName("Boylston")),
+                    Stop(stop_id=StopID("70157"), name=StopName("Arlington")),
+                    Stop(stop_id=StopID("70155"), name=StopName("Copley")),
+                    Stop(
+                        stop_id=StopID("70153"),
+                        name=StopName("Hynes Convention Center"),
+                    ),
+                    Stop(stop_id=StopID("71151"), name=StopName("Kenmore")),
+                    Stop(stop_id=StopID("70149"), name=StopName("Blandford Street")),
+                ],
+            )
+        ],
+    ),
+    Route(
+        route_id=RouteID("Green-D"),
+        name=RouteName("Green Line D"),
+        route_patterns=[
+            RoutePattern(
+                route_pattern_id="Green-D-855-0",
+                route_pattern_name="Union Square - Riverside",
+                representative_trip_id="canonical-Green-D-C1-0",
+                stops=[
+                    Stop(stop_id=StopID("70504"), name=StopName("Union Square")),
+                    Stop(stop_id=StopID("70196"), name=StopName("Park Street")),
+                    Stop(stop_id=StopID("70159"), name=StopName("Boylston")),
+                    Stop(stop_id=StopID("70157"), name=StopName("Arlington")),
+                    Stop(stop_id=StopID("70155"), name=StopName("Copley")),
+                    Stop(
+                        stop_id=StopID("70153"),
+                        name=StopName("Hynes Convention Center"),
+                    ),
+                    Stop(stop_id=StopID("71151"), name=StopName("Kenmore")),
+                    Stop(stop_id=StopID("70187"), name=StopName("Fenway")),
+                ],
+            )
+        ],
+    ),
+]
+
+
+test_parameters = (
+    "start_stop, end_stop, expected_routes",
+    [
+        ("Fields Corner", "Union Square", [{"Green Line D", "Red Line"}]),
+        ("Park Street", "Quincy Adams", [{"Red Line"}]),
+        ("Fenway", "Union Square", [{"Green Line D", "Green Line B"}]),
+        ("Union Square", "Alewife", [{"Green Line D", "Red Line"}]),
+        ("Ashmont", "Arlington", [{"Green Line B", "Red Line", "Green Line D"}]),
+    ],
+)
@@ -0,0 +1,88 @@
+import time
+
+import pytest
+
+from exceptions import TransitAPIRequestException
+from mock_transit_api_server import (
+    MockTransitAPIServer,
+    generate_synthetic_routes,
+    record_transit_api_responses,
+)
+from route_data_repository import RouteDataRepository
+from subway_system_dict_graph import SubwaySystemDictGraph
+from tests.fixtures import ROUTES
+
+
+def test_serves_routes():
+    with MockTransitAPIServer.from_routes(ROUTES) as server:
+        routes = RouteDataRepository(
+            server.settings
+        ).create_routes_intermediate_data_structure()
+
+    assert routes == ROUTES
+    assert server.status_code_counts == {200: 5}
+
+
+def test_replays_recording(tmp_path):
+    recording_path = str(tmp_path / "recording.json")
+    with MockTransitAPIServer.from_routes(ROUTES) as server:
+        record_transit_api_responses(server.settings, recording_path)
+
+    with MockTransitAPIServer.from_recording(recording_path) as server:
+        routes = RouteDataRepository(
+            server.settings
+        ).create_routes_intermediate_data_structure()
+
+    assert routes == ROUTES
+
+
+def test_latency():
+    with MockTransitAPIServer.from_routes(ROUTES, latency_seconds=0.05) as server:
+        start = time.perf_counter()
+        RouteDataRepository(server.settings).create_routes_intermediate_data_structure()
+
+    # One /routes request and four /trips requests, one after another
+    assert time.perf_counter() - start >= 5 * 0.05
+
+
+def test_error_rate():
+    with MockTransitAPIServer.from_routes(ROUTES, error_rate=1.0) as server:
+        with pytest.raises(TransitAPIRequestException):
+            RouteDataRepository(
+                server.settings
+            ).create_routes_intermediate_data_structure()
+
+    assert server.status_code_counts == {500: 1}
+
+
+def test_rate_limit():
+    with MockTransitAPIServer.from_routes(ROUTES, rate_limit=2) as server:
+        with pytest.raises(TransitAPIRequestException):
+            RouteDataRepository(
+                server.settings
+            ).create_routes_intermediate_data_structure()
+
+    assert server.status_code_counts == {200: 2, 429: 1}
+
+
+def test_generate_synthetic_routes():
+    routes = generate_synthetic_routes(
+        num_rows=4, stops_per_row=10, transfer_interval=5
+    )
+    graph = SubwaySystemDictGraph(routes)
+
+    assert [route.route_id for route in routes] == [
+        "Row-0",
+        "Row-1",
+        "Row-2",
+        "Row-3",
+        "Column-0",
+        "Column-5",
+    ]
+    assert len(graph.transform_routes_list_to_graph(routes)) == 40
+    assert len(graph.get_transfer_stops()) == 8
+    assert graph.find_routes_between_two_stops("Stop 0-9", "Stop 3-9")[0] == {
+        "Row 0 Line",
+        "Column 5 Line",
+        "Row 3 Line",
+    }
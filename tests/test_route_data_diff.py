@@ -0,0 +1,83 @@
+import copy
+
+from custom_types import RouteID, RouteName, StopID, StopName
+from models import RoutePattern, Route, Stop
+from route_data_diff import diff_routes
+from subway_system_dict_graph import SubwaySystemDictGraph
+from tests.fixtures import ROUTES
+
+BLUE_LINE = Route(
+    route_id=RouteID("Blue"),
+    name=RouteName("Blue Line"),
+    route_patterns=[
+        RoutePattern(
+            route_pattern_id="Blue-6-0",
+            route_pattern_name="Wonderland - Bowdoin",
+            representative_trip_id="canonical-Blue-C1-0",
+            stops=[
+                Stop(stop_id=StopID("70059"), name=StopName("Wonderland")),
+                Stop(stop_id=StopID("70041"), name=StopName("State")),
+                Stop(stop_id=StopID("70838"), name=StopName("Bowdoin")),
+            ],
+        )
+    ],
+)
+
+
+def _create_new_routes():
+    red_line, green_line_b, green_line_d = copy.deepcopy(ROUTES)
+
+    # Rename a stop served by both Green Line branches
+    for route in (green_line_b, green_line_d):
+        for stop in route.route_patterns[0].stops:
+            if stop.stop_id == "70157":
+                stop.name = StopName("Arlington Street")
+
+    # Cut the Red Line Ashmont branch back to Fields Corner
+    red_line.route_patterns[0].stops = red_line.route_patterns[0].stops[:-2]
+
+    return [red_line, green_line_d, BLUE_LINE]
+
+
+def test_diff_routes():
+    change_set = diff_routes(ROUTES, _create_new_routes())
+
+    assert change_set.routes_added == {"Blue"}
+    assert change_set.routes_removed == {"Green-B"}
+    assert change_set.routes_renamed == {}
+    assert change_set.patterns_added == {"Blue-6-0"}
+    assert change_set.patterns_removed == {"Green-B-812-0"}
+    assert change_set.patterns_rerouted == {"Red-1-0"}
+    assert change_set.stops_added == {"70059", "70041", "70838"}
+    # Blandford Street is only on Green Line B, Shawmut and Ashmont are cut from the Red Line
+    assert change_set.stops_removed == {"70149", "70091", "70093"}
+    assert change_set.stops_renamed == {"70157": ("Arlington", "Arlington Street")}
+    assert change_set.changed_route_ids == {"Red", "Green-B", "Green-D", "Blue"}
+
+
+def test_diff_routes_unchanged():
+    change_set = diff_routes(ROUTES, copy.deepcopy(ROUTES))
+
+    assert change_set.is_empty
+    assert change_set.changed_route_ids == set()
+
+
+def test_diff_routes_renamed_route():
+    new_routes = copy.deepcopy(ROUTES)
+    new_routes[0].name = RouteName("Red Line (Subway)")
+
+    change_set = diff_routes(ROUTES, new_routes)
+
+    assert change_set.routes_renamed == {"Red": ("Red Line", "Red Line (Subway)")}
+    assert change_set.changed_route_ids == {"Red"}
+
+
+def test_apply_change_set_matches_full_rebuild():
+    new_routes = _create_new_routes()
+    graph = SubwaySystemDictGraph(routes=ROUTES)
+
+    graph.apply_change_set(diff_routes(ROUTES, new_routes))
+
+    assert graph._graph == SubwaySystemDictGraph.transform_routes_list_to_graph(
+        new_routes
+    )
@@ -0,0 +1,78 @@
+import pytest
+
+from models import Leg
+from stop_sequence_index import StopSequenceIndex
+from tests.fixtures import ROUTES
+
+
+def test_get_stop_position():
+    index = StopSequenceIndex(ROUTES)
+
+    assert index.get_stop_position("Red-3-0", "70061") == 0
+    assert index.get_stop_position("Red-3-0", "70105") == 8
+    assert index.get_stop_position("Red-3-0", "70093") is None
+
+
+@pytest.mark.parametrize(
+    "route_pattern_id, from_stop_id, to_stop_id, expected_num_stops",
+    [
+        ("Red-1-0", "70075", "70093", 6),
+        ("Red-1-0", "70093", "70075", -6),
+        ("Red-1-0", "70075", "70105", None),
+        ("Green-D-855-0", "70504", "70187", 7),
+    ],
+)
+def test_get_num_stops_between(
+    route_pattern_id, from_stop_id, to_stop_id, expected_num_stops
+):
+    index = StopSequenceIndex(ROUTES)
+
+    assert (
+        index.get_num_stops_between(route_pattern_id, from_stop_id, to_stop_id)
+        == expected_num_stops
+    )
+
+
+@pytest.mark.parametrize(
+    "start_stop, end_stop, expected_leg",
+    [
+        (
+            "Park Street",
+            "Quincy Adams",
+            Leg("Red Line", "Park Street", "Quincy Adams", 6),
+        ),
+        ("Quincy Adams", "Alewife", Leg("Red Line", "Quincy Adams", "Alewife", 7)),
+        (
+            "Arlington",
+            "Park Street",
+            Leg("Green Line B", "Arlington", "Park Street", 2),
+        ),
+        ("Fenway", "Alewife", None),
+        ("West Station", "Alewife", None),
+    ],
+)
+def test_find_same_route_leg(start_stop, end_stop, expected_leg):
+    index = StopSequenceIndex(ROUTES)
+
+    assert index.find_same_route_leg(start_stop, end_stop) == expected_leg
+
+
+def test_get_max_and_min_num_stops():
+    index = StopSequenceIndex(ROUTES)
+
+    for route in ROUTES:
+        assert index.get_max_num_stops(route.route_id) == route.max_num_stops
+        assert index.get_min_num_stops(route.route_id) == route.min_num_stops
+
+
+def test_remove_route():
+    index = StopSequenceIndex(ROUTES)
+    index.remove_route(ROUTES[1])
+
+    assert index.get_stop_position("Green-B-812-0", "70196") is None
+    assert index.find_same_route_leg("Arlington", "Park Street") == Leg(
+        "Green Line D", "Arlington", "Park Street", 2
+    )
+    assert index.find_same_route_leg("Blandford Street", "Kenmore") is None
+    with pytest.raises(KeyError):
+        index.get_max_num_stops("Green-B")
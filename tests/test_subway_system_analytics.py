@@ -0,0 +1,99 @@
+import networkx as nx
+import pytest
+
+from mock_transit_api_server import generate_synthetic_routes
+from subway_system_analytics import SubwaySystemAnalytics
+from subway_system_dict_graph import SubwaySystemDictGraph
+from tests.fixtures import ROUTES
+
+
+@pytest.mark.parametrize("max_hops", [0, 1, 3, 100])
+def test_count_reachable_stops_within_hops(max_hops):
+    analytics = SubwaySystemAnalytics(routes=ROUTES)
+    graph = nx.Graph(SubwaySystemDictGraph.transform_routes_list_to_graph(ROUTES))
+
+    expected = {
+        stop: len(nx.single_source_shortest_path_length(graph, stop, cutoff=max_hops))
+        - 1
+        for stop in graph.nodes
+    }
+    assert analytics.count_reachable_stops_within_hops(max_hops) == expected
+
+
+def test_count_reachable_stops_within_transfers():
+    analytics = SubwaySystemAnalytics(routes=ROUTES)
+
+    no_transfers = analytics.count_reachable_stops_within_transfers(0)
+    assert no_transfers["Alewife"] == 12
+    assert no_transfers["Fenway"] == 7
+    assert no_transfers["Park Street"] == 20
+
+    one_transfer = analytics.count_reachable_stops_within_transfers(1)
+    assert one_transfer["Alewife"] == 20
+    assert one_transfer["Fenway"] == 20
+
+
+def test_get_transfer_distance_histogram():
+    analytics = SubwaySystemAnalytics(routes=ROUTES)
+    histogram = analytics.get_transfer_distance_histogram()
+
+    # 21 stops, all connected, and every route touches Park Street, so one transfer is always enough
+    assert sum(histogram.values()) == 21 * 20
+    assert set(histogram) == {0, 1}
+
+
+@pytest.mark.parametrize("normalized", [True, False])
+def test_get_betweenness_centrality(normalized):
+    analytics = SubwaySystemAnalytics(routes=ROUTES)
+    graph = nx.Graph(SubwaySystemDictGraph.transform_routes_list_to_graph(ROUTES))
+
+    expected = nx.betweenness_centrality(graph, normalized=normalized)
+    betweenness = analytics.get_betweenness_centrality(normalized=normalized)
+
+    assert betweenness.keys() == expected.keys()
+    for stop, value in expected.items():
+        assert betweenness[stop] == pytest.approx(value)
+
+
+def test_get_most_central_stops():
+    analytics = SubwaySystemAnalytics(routes=ROUTES)
+
+    # South Station is where the two Red Line branches split, so every trip to either branch passes through it
+    assert analytics.get_most_central_stops(1) == ["South Station"]
+
+
+def test_get_betweenness_centrality_empty_network():
+    analytics = SubwaySystemAnalytics(routes=[])
+
+    assert analytics.get_betweenness_centrality() == {}
+    assert analytics.get_most_central_stops(3) == []
+
+
+def test_get_betweenness_centrality_raises_error_for_no_sample_sources():
+    analytics = SubwaySystemAnalytics(routes=ROUTES)
+
+    with pytest.raises(ValueError):
+        analytics.get_betweenness_centrality(num_sample_sources=0)
+
+
+def test_analytics_on_large_network():
+    # 40 x 50 grid: 2,000 stops and 50 routes
+    routes = generate_synthetic_routes(num_rows=40, stops_per_row=50)
+    analytics = SubwaySystemAnalytics(routes=routes)
+    graph = nx.Graph(SubwaySystemDictGraph.transform_routes_list_to_graph(routes))
+
+    reachable = analytics.count_reachable_stops_within_hops(5)
+    for stop in ["Stop 0-0", "Stop 17-23", "Stop 39-49"]:
+        assert (
+            reachable[stop]
+            == len(nx.single_source_shortest_path_length(graph, stop, cutoff=5)) - 1
+        )
+
+    # Every row route crosses every column route, so two transfers reach any stop
+    histogram = analytics.get_transfer_distance_histogram()
+    assert sum(histogram.values()) == 2000 * 1999
+    assert max(histogram) == 2
+
+    betweenness = analytics.get_betweenness_centrality(num_sample_sources=100)
+    assert len(betweenness) == 2000
+    assert all(value >= 0 for value in betweenness.values())
@@ -1,96 +1,13 @@
+import threading
+import timeit
+
 import pytest
 
-from custom_types import RouteID, RouteName, StopID, StopName
 from exceptions import InvalidSubwayStopInputException
-from models import RoutePattern, Route, Stop
+from mock_transit_api_server import generate_synthetic_routes
+from models import Itinerary, Leg
 from subway_system_dict_graph import SubwaySystemDictGraph
-
-ROUTES = [
-    Route(
-        route_id=RouteID("Red"),
-        name=RouteName("Red Line"),
-        route_patterns=[
-            RoutePattern(
-                route_pattern_id="Red-1-0",
-                route_pattern_name="Alewife - Ashmont",
-                representative_trip_id="canonical-Red-C2-0",
-                stops=[
-                    Stop(stop_id=StopID("70061"), name=StopName("Alewife")),
-                    Stop(stop_id=StopID("70075"), name=StopName("Park Street")),
-                    Stop(stop_id=StopID("70077"), name=StopName("Downtown Crossing")),
-                    Stop(stop_id=StopID("70079"), name=StopName("South Station")),
-                    Stop(stop_id=StopID("70087"), name=StopName("Savin Hill")),
-                    Stop(stop_id=StopID("70089"), name=StopName("Fields Corner")),
-                    Stop(stop_id=StopID("70091"), name=StopName("Shawmut")),
-                    Stop(stop_id=StopID("70093"), name=StopName("Ashmont")),
-                ],
-            ),
-            RoutePattern(
-                route_pattern_id="Red-3-0",
-                route_pattern_name="Alewife - Braintree",
-                representative_trip_id="canonical-Red-C1-0",
-                stops=[
-                    Stop(stop_id=StopID("70061"), name=StopName("Alewife")),
-                    Stop(stop_id=StopID("70075"), name=StopName("Park Street")),
-                    Stop(stop_id=StopID("70077"), name=StopName("Downtown Crossing")),
-                    Stop(stop_id=StopID("70079"), name=StopName("South Station")),
-                    Stop(stop_id=StopID("70097"), name=StopName("North Quincy")),
-                    Stop(stop_id=StopID("70099"), name=StopName("Wollaston")),
-                    Stop(stop_id=StopID("70101"), name=StopName("Quincy Center")),
-                    Stop(stop_id=StopID("70103"), name=StopName("Quincy Adams")),
-                    Stop(stop_id=StopID("70105"), name=StopName("Braintree")),
-                ],
-            ),
-        ],
-    ),
-    Route(
-        route_id=RouteID("Green-B"),
-        name=RouteName("Green Line B"),
-        route_patterns=[
-            RoutePattern(
-                route_pattern_id="Green-B-812-0",
-                route_pattern_name="Government Center - Boston College",
-                representative_trip_id="canonical-Green-B-C1-0",
-                stops=[
-                    Stop(stop_id=StopID("70196"), name=StopName("Park Street")),
-                    Stop(stop_id=StopID("70159"), name=StopName("Boylston")),
-                    Stop(stop_id=StopID("70157"), name=StopName("Arlington")),
-                    Stop(stop_id=StopID("70155"), name=StopName("Copley")),
-                    Stop(
-                        stop_id=StopID("70153"),
-                        name=StopName("Hynes Convention Center"),
-                    ),
-                    Stop(stop_id=StopID("71151"), name=StopName("Kenmore")),
-                    Stop(stop_id=StopID("70149"), name=StopName("Blandford Street")),
-                ],
-            )
-        ],
-    ),
-    Route(
-        route_id=RouteID("Green-D"),
-        name=RouteName("Green Line D"),
-        route_patterns=[
-            RoutePattern(
-                route_pattern_id="Green-D-855-0",
-                route_pattern_name="Union Square - Riverside",
-                representative_trip_id="canonical-Green-D-C1-0",
-                stops=[
-                    Stop(stop_id=StopID("70504"), name=StopName("Union Square")),
-                    Stop(stop_id=StopID("70196"), name=StopName("Park Street")),
-                    Stop(stop_id=StopID("70159"), name=StopName("Boylston")),
-                    Stop(stop_id=StopID("70157"), name=StopName("Arlington")),
-                    Stop(stop_id=StopID("70155"), name=StopName("Copley")),
-                    Stop(
-                        stop_id=StopID("70153"),
-                        name=StopName("Hynes Convention Center"),
-                    ),
-                    Stop(stop_id=StopID("71151"), name=StopName("Kenmore")),
-                    Stop(stop_id=StopID("70187"), name=StopName("Fenway")),
-                ],
-            )
-        ],
-    ),
-]
+from tests.fixtures import ROUTES, test_parameters
 
 
 def test_transform_routes_list_to_graph():
@@ -162,18 +79,6 @@ def test_get_transfer_stops():
     }
 
 
-test_parameters = (
-    "start_stop, end_stop, expected_routes",
-    [
-        ("Fields Corner", "Union Square", [{"Green Line D", "Red Line"}]),
-        ("Park Street", "Quincy Adams", [{"Red Line"}]),
-        ("Fenway", "Union Square", [{"Green Line D", "Green Line B"}]),
-        ("Union Square", "Alewife", [{"Green Line D", "Red Line"}]),
-        ("Ashmont", "Arlington", [{"Green Line B", "Red Line", "Green Line D"}]),
-    ],
-)
-
-
 @pytest.mark.parametrize(*test_parameters)
 def test_find_routes_between_two_stops(start_stop, end_stop, expected_routes):
     graph = SubwaySystemDictGraph(routes=ROUTES)
@@ -187,3 +92,134 @@ def test_find_routes_between_two_stops_raises_error():
 
     with pytest.raises(InvalidSubwayStopInputException):
         graph.find_routes_between_two_stops("West Station", "Alewife")
+
+
+@pytest.mark.parametrize(
+    "start_stop, end_stop, expected_legs",
+    [
+        (
+            "Fields Corner",
+            "Union Square",
+            [
+                Leg("Red Line", "Fields Corner", "Park Street", 4),
+                Leg("Green Line D", "Park Street", "Union Square", 1),
+            ],
+        ),
+        (
+            "Ashmont",
+            "Arlington",
+            [
+                Leg("Red Line", "Ashmont", "Park Street", 6),
+                Leg("Green Line B", "Park Street", "Arlington", 2),
+            ],
+        ),
+        ("Fenway", "Union Square", [Leg("Green Line D", "Fenway", "Union Square", 7)]),
+        ("Park Street", "Park Street", []),
+    ],
+)
+def test_find_itinerary_between_two_stops(start_stop, end_stop, expected_legs):
+    graph = SubwaySystemDictGraph(routes=ROUTES)
+    itinerary = graph.find_itinerary_between_two_stops(start_stop, end_stop)
+
+    assert itinerary == Itinerary(legs=expected_legs)
+
+
+def test_find_itinerary_between_two_stops_after_add_route():
+    graph = SubwaySystemDictGraph(routes=ROUTES[:1])
+    assert (
+        graph.find_itinerary_between_two_stops("Alewife", "Braintree").num_transfers
+        == 0
+    )
+
+    graph.add_route(ROUTES[2])
+    itinerary = graph.find_itinerary_between_two_stops("Braintree", "Fenway")
+
+    assert itinerary.route_names == ["Red Line", "Green Line D"]
+    assert itinerary.num_transfers == 1
+
+
+def test_add_and_remove_routes_match_full_rebuild():
+    routes = generate_synthetic_routes(num_rows=6, stops_per_row=8, transfer_interval=3)
+    remaining_routes = routes[1::2]
+    graph = SubwaySystemDictGraph(routes=[])
+    for route in routes:
+        graph.add_route(route)
+    for route in routes[::2]:
+        graph.remove_route(route)
+
+    rebuilt_graph = SubwaySystemDictGraph(routes=remaining_routes)
+    stop_names = list(rebuilt_graph.transform_routes_list_to_graph(remaining_routes))
+
+    assert graph.get_transfer_stops() == rebuilt_graph.get_transfer_stops()
+    for start_stop in stop_names:
+        for end_stop in stop_names:
+            assert graph.find_routes_between_two_stops(
+                start_stop, end_stop
+            ) == rebuilt_graph.find_routes_between_two_stops(start_stop, end_stop)
+    with pytest.raises(InvalidSubwayStopInputException):
+        graph.find_routes_between_two_stops("Stop 0-1", stop_names[0])
+
+
+def test_add_route_takes_about_as_long_as_full_rebuild():
+    routes = generate_synthetic_routes(
+        num_rows=100, stops_per_row=60, transfer_interval=5
+    )
+
+    def add_routes():
+        graph = SubwaySystemDictGraph(routes=[])
+        for route in routes:
+            graph.add_route(route)
+
+    # Best of three runs, to leave out pauses unrelated to the graph
+    full_rebuild_seconds = min(
+        timeit.repeat(lambda: SubwaySystemDictGraph(routes=routes), number=1, repeat=3)
+    )
+    add_route_seconds = min(timeit.repeat(add_routes, number=1, repeat=3))
+
+    # Rebuilding the whole path index after each route took over 10 times as long as a full rebuild
+    assert add_route_seconds < 5 * full_rebuild_seconds
+
+
+def test_queries_while_routes_change():
+    graph = SubwaySystemDictGraph(routes=ROUTES[:2])
+    is_done = threading.Event()
+    errors = []
+
+    def add_and_remove_route():
+        while not is_done.is_set():
+            graph.add_route(ROUTES[2])
+            graph.remove_route(ROUTES[2])
+
+    def query():
+        try:
+            for _ in range(2000):
+                assert graph.find_routes_between_two_stops("Alewife", "Braintree") == [
+                    {"Red Line"}
+                ]
+                # Union Square is only served by the route being added and removed
+                try:
+                    routes = graph.find_routes_between_two_stops(
+                        "Alewife", "Union Square"
+                    )
+                    itinerary = graph.find_itinerary_between_two_stops(
+                        "Union Square", "Braintree"
+                    )
+                except InvalidSubwayStopInputException:
+                    continue
+                assert routes == [{"Red Line", "Green Line D"}]
+                assert itinerary.route_names == ["Green Line D", "Red Line"]
+                assert "Park Street" in graph.get_transfer_stops()
+        except Exception as exception:
+            errors.append(exception)
+
+    writer = threading.Thread(target=add_and_remove_route)
+    readers = [threading.Thread(target=query) for _ in range(4)]
+    writer.start()
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join()
+    is_done.set()
+    writer.join()
+
+    assert errors == []
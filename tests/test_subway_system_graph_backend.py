@@ -0,0 +1,143 @@
+import copy
+import dataclasses
+import tracemalloc
+
+import pytest
+
+from exceptions import InvalidGraphBackendException, InvalidSubwayStopInputException
+from subway_system_graph_backend import (
+    GRAPH_BACKEND_LOADERS,
+    benchmark_graph_backend,
+    get_graph_backend,
+)
+from mock_transit_api_server import generate_synthetic_routes
+from tests.conftest import GRAPH_BACKEND_BENCHMARK_PROPERTY
+from tests.fixtures import ROUTES, test_parameters
+
+GRAPH_BACKEND_NAMES = list(GRAPH_BACKEND_LOADERS)
+
+
+@pytest.mark.parametrize("backend_name", GRAPH_BACKEND_NAMES)
+def test_get_transfer_stops(backend_name):
+    graph = get_graph_backend(backend_name)(ROUTES)
+
+    assert graph.get_transfer_stops() == {
+        "Arlington": {"Green Line D", "Green Line B"},
+        "Boylston": {"Green Line D", "Green Line B"},
+        "Copley": {"Green Line D", "Green Line B"},
+        "Hynes Convention Center": {"Green Line D", "Green Line B"},
+        "Kenmore": {"Green Line D", "Green Line B"},
+        "Park Street": {"Green Line D", "Red Line", "Green Line B"},
+    }
+
+
+@pytest.mark.parametrize("backend_name", GRAPH_BACKEND_NAMES)
+def test_stop_sequence_index(backend_name):
+    graph = get_graph_backend(backend_name)(ROUTES)
+
+    assert [
+        (
+            graph.stop_sequence_index.get_max_num_stops(route.route_id),
+            graph.stop_sequence_index.get_min_num_stops(route.route_id),
+        )
+        for route in ROUTES
+    ] == [(route.max_num_stops, route.min_num_stops) for route in ROUTES]
+
+
+@pytest.mark.parametrize("backend_name", GRAPH_BACKEND_NAMES)
+@pytest.mark.parametrize(*test_parameters)
+def test_find_routes_between_two_stops(
+    backend_name, start_stop, end_stop, expected_routes
+):
+    graph = get_graph_backend(backend_name)(ROUTES)
+    routes = graph.find_routes_between_two_stops(start_stop, end_stop)
+
+    assert routes[0] == expected_routes[0]
+
+
+@pytest.mark.parametrize("backend_name", GRAPH_BACKEND_NAMES)
+@pytest.mark.parametrize(*test_parameters)
+def test_find_itinerary_between_two_stops(
+    backend_name, start_stop, end_stop, expected_routes
+):
+    graph = get_graph_backend(backend_name)(ROUTES)
+    itinerary = graph.find_itinerary_between_two_stops(start_stop, end_stop)
+
+    assert itinerary == get_graph_backend("dict")(
+        ROUTES
+    ).find_itinerary_between_two_stops(start_stop, end_stop)
+    assert set(itinerary.route_names) <= expected_routes[0]
+    assert itinerary.legs[0].boarding_stop == start_stop
+    assert itinerary.legs[-1].alighting_stop == end_stop
+
+
+@pytest.mark.parametrize("backend_name", GRAPH_BACKEND_NAMES)
+def test_find_routes_between_two_stops_not_connected(backend_name):
+    routes = copy.deepcopy(ROUTES)
+    # Split the Red Line off from the Green Line
+    for route_pattern in routes[0].route_patterns:
+        route_pattern.stops = route_pattern.stops[2:]
+    graph = get_graph_backend(backend_name)(routes)
+
+    assert graph.find_routes_between_two_stops("Downtown Crossing", "Fenway") == []
+    assert graph.find_itinerary_between_two_stops("Downtown Crossing", "Fenway") is None
+
+
+@pytest.mark.parametrize("backend_name", GRAPH_BACKEND_NAMES)
+def test_find_routes_between_two_stops_raises_error(backend_name):
+    graph = get_graph_backend(backend_name)(ROUTES)
+
+    with pytest.raises(InvalidSubwayStopInputException):
+        graph.find_routes_between_two_stops("West Station", "Alewife")
+
+    with pytest.raises(InvalidSubwayStopInputException):
+        graph.find_routes_between_two_stops("Alewife", "West Station")
+
+    with pytest.raises(InvalidSubwayStopInputException):
+        graph.find_itinerary_between_two_stops("West Station", "Alewife")
+
+
+def test_get_graph_backend_raises_error():
+    with pytest.raises(InvalidGraphBackendException):
+        get_graph_backend("adjacency-matrix")
+
+
+@pytest.mark.parametrize("backend_name", GRAPH_BACKEND_NAMES)
+@pytest.mark.parametrize(
+    "network_name, routes, stop_pairs",
+    [
+        (
+            "fixture",
+            ROUTES,
+            [(start, end) for start, end, _ in test_parameters[1]],
+        ),
+        (
+            "synthetic 20x50",
+            generate_synthetic_routes(num_rows=20, stops_per_row=50),
+            [("Stop 0-0", "Stop 19-49"), ("Stop 5-3", "Stop 14-47")],
+        ),
+    ],
+)
+def test_benchmark_graph_backend(
+    backend_name, network_name, routes, stop_pairs, record_property
+):
+    benchmark = benchmark_graph_backend(backend_name, routes, stop_pairs)
+
+    # Reported in the terminal summary by tests/conftest.py, and in --junitxml output
+    record_property(
+        GRAPH_BACKEND_BENCHMARK_PROPERTY,
+        {"network_name": network_name, **dataclasses.asdict(benchmark)},
+    )
+    assert benchmark.backend_name == backend_name
+    assert benchmark.build_time_seconds > 0
+    assert 0 < benchmark.mean_query_time_seconds <= benchmark.max_query_time_seconds
+    assert benchmark.memory_bytes > 0
+
+
+def test_benchmark_graph_backend_keeps_caller_tracing():
+    tracemalloc.start()
+    try:
+        benchmark_graph_backend("dict", ROUTES, [])
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,162 @@
+import asyncio
+import threading
+
+import pytest
+
+from exceptions import TransitAPIRequestException
+from mock_transit_api_server import (
+    create_routes_response,
+    create_trip_responses,
+    generate_synthetic_routes,
+)
+from route_data_repository import RouteDataRepository
+from settings import Settings
+from subway_system_dict_graph import SubwaySystemDictGraph
+from subway_system_graph_pipeline import SubwaySystemGraphPipeline
+from tests.fixtures import ROUTES
+
+
+@pytest.fixture
+def route_repository(monkeypatch):
+    route_repository = RouteDataRepository(Settings(transit_api_base_url="http://test"))
+    trip_responses = create_trip_responses(ROUTES)
+
+    monkeypatch.setattr(
+        route_repository,
+        "_get_subway_routes_and_route_patterns",
+        lambda: create_routes_response(ROUTES),
+    )
+    monkeypatch.setattr(
+        route_repository, "_get_trip_and_stops", lambda trip_id: trip_responses[trip_id]
+    )
+    return route_repository
+
+
+def test_create_routes_intermediate_data_structure(route_repository):
+    assert route_repository.create_routes_intermediate_data_structure() == ROUTES
+
+
+def test_pipeline_run(route_repository):
+    pipeline = SubwaySystemGraphPipeline(route_repository, max_queued_routes=1)
+    routes = asyncio.run(pipeline.run())
+
+    assert sorted(routes, key=lambda route: route.route_id) == sorted(
+        ROUTES, key=lambda route: route.route_id
+    )
+    assert (
+        pipeline.graph._graph
+        == SubwaySystemDictGraph.transform_routes_list_to_graph(ROUTES)
+    )
+
+
+def test_pipeline_queries_loaded_routes_before_run_finishes(
+    route_repository, monkeypatch
+):
+    trip_responses = create_trip_responses(ROUTES)
+    release_green_line_d = threading.Event()
+
+    def get_trip_and_stops(trip_id):
+        if trip_id == "canonical-Green-D-C1-0":
+            release_green_line_d.wait(timeout=5)
+        return trip_responses[trip_id]
+
+    monkeypatch.setattr(route_repository, "_get_trip_and_stops", get_trip_and_stops)
+
+    async def query_while_loading():
+        pipeline = SubwaySystemGraphPipeline(route_repository)
+        run_task = asyncio.create_task(pipeline.run())
+
+        await pipeline.wait_for_route("Red")
+        await pipeline.wait_for_route("Green-B")
+        assert "Green-D" not in pipeline.loaded_route_ids
+        partial_routes = pipeline.graph.find_routes_between_two_stops(
+            "Braintree", "Kenmore"
+        )
+
+        release_green_line_d.set()
+        await run_task
+        return partial_routes
+
+    assert asyncio.run(query_while_loading())[0] == {"Red Line", "Green Line B"}
+
+
+def test_pipeline_run_raises_error(route_repository, monkeypatch):
+    def get_trip_and_stops(trip_id):
+        raise TransitAPIRequestException(f"Received non-200 response for {trip_id}")
+
+    monkeypatch.setattr(route_repository, "_get_trip_and_stops", get_trip_and_stops)
+    pipeline = SubwaySystemGraphPipeline(route_repository)
+
+    with pytest.raises(TransitAPIRequestException):
+        asyncio.run(pipeline.run())
+
+
+def test_stream_routes_slow_consumer_holds_back_fetching(route_repository, monkeypatch):
+    routes = generate_synthetic_routes(
+        num_rows=32, stops_per_row=3, transfer_interval=100
+    )
+    trip_responses = create_trip_responses(routes)
+    fetched_trip_ids = []
+
+    def get_trip_and_stops(trip_id):
+        fetched_trip_ids.append(trip_id)
+        return trip_responses[trip_id]
+
+    monkeypatch.setattr(
+        route_repository,
+        "_get_subway_routes_and_route_patterns",
+        lambda: create_routes_response(routes),
+    )
+    monkeypatch.setattr(route_repository, "_get_trip_and_stops", get_trip_and_stops)
+
+    async def consume_one_route_and_pause():
+        stream = route_repository.stream_routes(
+            max_concurrent_requests=4, max_queued_routes=1
+        )
+        await stream.__anext__()
+        await asyncio.sleep(0.2)
+        num_fetched_while_paused = len(fetched_trip_ids)
+        await stream.aclose()
+        return num_fetched_while_paused
+
+    # One route consumed, one in the queue and one waiting in each of the 4 workers
+    assert asyncio.run(consume_one_route_and_pause()) <= 1 + 1 + 4
+
+
+def test_wait_for_route_raises_error_when_run_fails(route_repository, monkeypatch):
+    def get_subway_routes_and_route_patterns():
+        raise TransitAPIRequestException("Received non-200 response for /routes")
+
+    monkeypatch.setattr(
+        route_repository,
+        "_get_subway_routes_and_route_patterns",
+        get_subway_routes_and_route_patterns,
+    )
+
+    async def wait_while_running():
+        pipeline = SubwaySystemGraphPipeline(route_repository)
+        wait_task = asyncio.create_task(pipeline.wait_for_route("Red"))
+        with pytest.raises(TransitAPIRequestException):
+            await pipeline.run()
+
+        with pytest.raises(TransitAPIRequestException):
+            await asyncio.wait_for(wait_task, timeout=1)
+        with pytest.raises(TransitAPIRequestException):
+            await asyncio.wait_for(pipeline.wait_for_route("Green-B"), timeout=1)
+
+    asyncio.run(wait_while_running())
+
+
+def test_wait_for_route_not_in_response(route_repository):
+    async def wait_while_running():
+        pipeline = SubwaySystemGraphPipeline(route_repository)
+        wait_task = asyncio.create_task(pipeline.wait_for_route("Orange"))
+        await pipeline.run()
+
+        return (
+            await asyncio.wait_for(wait_task, timeout=1),
+            await pipeline.wait_for_route("Red"),
+            await pipeline.wait_for_route("Blue"),
+        )
+
+    assert asyncio.run(wait_while_running()) == (False, True, False)
@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from exceptions import InvalidSubwaySystemInputException
+from subway_system_dict_graph import SubwaySystemDictGraph
+from subway_system_graph_registry import (
+    SubwaySystemGraphRegistry,
+    estimate_memory_footprint,
+)
+from tests.fixtures import ROUTES
+
+GRAPH_SIZES = {"MBTA": 40, "SEPTA": 30, "CTA": 50}
+
+
+class CountingGraphLoader:
+    def __init__(self, delay_seconds=0.0):
+        self.load_counts = {}
+        self._delay_seconds = delay_seconds
+        self._lock = threading.Lock()
+
+    def __call__(self, subway_system):
+        with self._lock:
+            self.load_counts[subway_system] = self.load_counts.get(subway_system, 0) + 1
+        time.sleep(self._delay_seconds)
+        return SubwaySystemDictGraph(ROUTES)
+
+
+def create_registry(load_graph, memory_budget_bytes=100):
+    graph_subway_systems = {}
+
+    def load_and_tag_graph(subway_system):
+        graph = load_graph(subway_system)
+        graph_subway_systems[id(graph)] = subway_system
+        return graph
+
+    return SubwaySystemGraphRegistry(
+        memory_budget_bytes=memory_budget_bytes,
+        load_graph=load_and_tag_graph,
+        measure_graph=lambda graph: GRAPH_SIZES[graph_subway_systems[id(graph)]],
+    )
+
+
+def test_get_graph_loads_once():
+    load_graph = CountingGraphLoader()
+    registry = create_registry(load_graph)
+
+    graph = registry.get_graph("MBTA")
+
+    assert registry.get_graph("MBTA") is graph
+    assert load_graph.load_counts == {"MBTA": 1}
+    assert registry.memory_usage_bytes == 40
+
+
+def test_get_graph_concurrent_first_requests_load_once():
+    load_graph = CountingGraphLoader(delay_seconds=0.1)
+    registry = create_registry(load_graph)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        graphs = list(executor.map(registry.get_graph, ["MBTA"] * 8))
+
+    assert all(graph is graphs[0] for graph in graphs)
+    assert load_graph.load_counts == {"MBTA": 1}
+
+
+def test_get_graph_evicts_least_recently_used():
+    load_graph = CountingGraphLoader()
+    registry = create_registry(load_graph)
+
+    registry.get_graph("MBTA")
+    registry.get_graph("SEPTA")
+    registry.get_graph("MBTA")
+    registry.get_graph("CTA")
+
+    # 40 + 30 + 50 is over the budget of 100, and SEPTA was requested least recently
+    assert registry.loaded_subway_systems == ["MBTA", "CTA"]
+    assert registry.memory_usage_bytes == 90
+
+    registry.get_graph("SEPTA")
+    assert load_graph.load_counts == {"MBTA": 1, "SEPTA": 2, "CTA": 1}
+
+
+def test_get_graph_keeps_graph_over_budget():
+    registry = create_registry(CountingGraphLoader(), memory_budget_bytes=10)
+
+    registry.get_graph("MBTA")
+    registry.get_graph("CTA")
+
+    assert registry.loaded_subway_systems == ["CTA"]
+
+
+def test_get_graph_raises_error_and_retries():
+    def load_graph(subway_system):
+        raise InvalidSubwaySystemInputException(
+            f"'{subway_system}' is not a supported subway system."
+        )
+
+    registry = create_registry(load_graph)
+
+    for _ in range(2):
+        with pytest.raises(InvalidSubwaySystemInputException):
+            registry.get_graph("BART")
+    assert registry.loaded_subway_systems == []
+
+
+def test_evict():
+    load_graph = CountingGraphLoader()
+    registry = create_registry(load_graph)
+
+    registry.get_graph("MBTA")
+    registry.evict("MBTA")
+    registry.get_graph("MBTA")
+
+    assert load_graph.load_counts == {"MBTA": 2}
+    assert registry.memory_usage_bytes == 40
+
+
+def test_estimate_memory_footprint():
+    small_graph = SubwaySystemDictGraph(ROUTES[:1])
+    graph = SubwaySystemDictGraph(ROUTES)
+
+    assert 0 < estimate_memory_footprint(small_graph) < estimate_memory_footprint(graph)